@@ -12,6 +12,7 @@ from .core.topology import Topology
 from .resources.read_write_bus import ReadBus
 from .resources.memory import Memory
 from .resources.compute import ComputeUnit
+from .resources.pe import ProcessingElement
 from .display import show_topology
 
 
@@ -112,12 +113,9 @@ def main(argv: list[str] | None = None) -> int:
 
 def _print_channel_summary(sim: Simulator) -> None:
     # Print average occupancy for channels
-    from .core.channel import Channel
-
     rows = []
-    for name, res in sim.topology.resources.items():
-        if isinstance(res, Channel):
-            rows.append((name, res.avg_occupancy, res._busy_ticks, res._ticks, res.transfer_mode))
+    for ch in sim.topology.channels:
+        rows.append((ch.name, ch.avg_occupancy, ch._busy_ticks, ch._ticks, ch.transfer_mode))
     if rows:
         print("Channel utilization (avg busy ratio):")
         print("name\tavg\tbusy/ticks\tmode")
@@ -125,7 +123,6 @@ def _print_channel_summary(sim: Simulator) -> None:
             print(f"{name}\t{avg:.2f}\t{busy}/{ticks}\t{mode}")
 
     # Processing elements utilization
-    from .resources.pe import ProcessingElement
     prows = []
     for name, res in sim.topology.resources.items():
         if isinstance(res, ProcessingElement):
@@ -1,9 +1,52 @@
 from __future__ import annotations
 
-from typing import Dict, Optional, Set, List, Any
+import heapq
+import sys
+from typing import Dict, Optional, Set, List, Any, Tuple, NamedTuple
 
 from .databuffer import DataBuffer, BufferRoles, BufferStates
 from .message import Message
+from .pools import ObjectPool
+
+
+class Trigger(NamedTuple):
+    """Pre-validated state-transition trigger targeting a semaphore station."""
+
+    on: str
+    kind: str  # "sem_signal" | "sem_wait"
+    station: str
+    index: int
+
+
+_TRIGGER_KINDS = {"signal": "sem_signal", "wait": "sem_wait"}
+
+
+def parse_trigger(trig: Dict[str, Any]) -> Trigger:
+    try:
+        on = str(trig["on"])
+        kind = _TRIGGER_KINDS[str(trig["action"])]
+        station = str(trig["station"])
+        index = int(trig["index"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Malformed trigger: {trig!r}") from e
+    if on not in BufferStates.ALL:
+        raise ValueError(f"Trigger state {on!r} is not a buffer state")
+    return Trigger(on, kind, station, index)
+
+
+def _parse_attached(triggers: List[Dict[str, Any]]) -> Dict[str, List[Trigger]]:
+    # Lenient parse for triggers attached to a buffer: any action other than
+    # "signal" waits, and malformed entries are skipped rather than raised
+    by_state: Dict[str, List[Trigger]] = {}
+    for trig in triggers:
+        try:
+            on = str(trig["on"])
+            kind = "sem_signal" if str(trig.get("action")) == "signal" else "sem_wait"
+            parsed = Trigger(on, kind, str(trig["station"]), int(trig["index"]))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+        by_state.setdefault(on, []).append(parsed)
+    return by_state
 
 
 class BufferPool:
@@ -11,137 +54,227 @@ class BufferPool:
     Global buffer pool for tracking all dynamic DataBuffers in the system.
 
     - Registers buffers and tracks ownership by resource name (e.g., memory id).
+      `DataBuffer.owner_memory` is the owner of record; the pool keeps only the
+      reverse owner -> buffers index.
     - Supports ownership transfer and deletion.
     - Computes total and per-owner allocated bytes.
+    - Fires semaphore triggers on state transitions: the pool's own (from
+      add_trigger/set_triggers) first, then those in the buffer's `triggers`
+      list. The attached list is re-parsed whenever it changes; malformed
+      entries in it are ignored.
+    - recycle_limit > 0 keeps up to that many deleted pool-made buffers
+      (from create/schedule_transfer) on a free-list for reuse. Callers must
+      not hold on to such buffers after deleting them.
     """
 
-    def __init__(self) -> None:
-        self._buffers: Dict[str, DataBuffer] = {}
-        self._owner_of: Dict[str, Optional[str]] = {}
-        self._owned_by: Dict[Optional[str], Set[str]] = {}
-        self._triggers: Dict[str, List[Dict[str, Any]]] = {}
-        self._expected_arrival: Dict[str, int] = {}
+    def __init__(self, recycle_limit: int = 0) -> None:
+        self._buffers: Dict[int, DataBuffer] = {}
+        self._owned_by: Dict[Optional[str], Set[int]] = {}
+        # buffer_id -> state -> triggers firing on entry to that state
+        self._triggers: Dict[int, Dict[str, List[Trigger]]] = {}
+        # buffer_id -> (attached list, snapshot of it, parsed by state)
+        self._attached: Dict[int, Tuple[list, list, Dict[str, List[Trigger]]]] = {}
+        self._expected_arrival: Dict[int, int] = {}
+        # Min-heap of (tick, is_str_id, buffer_id); entries not matching _expected_arrival
+        # are stale. The flag keeps imported string ids from being compared with ints.
+        self._arrival_heap: List[Tuple[int, bool, Any]] = []
         # Transfer metadata: destination buffer -> info about source, target PE/queue
-        self._transfer_meta: Dict[str, Dict[str, Any]] = {}
+        self._transfer_meta: Dict[int, Dict[str, Any]] = {}
+        # Running byte counters so accounting queries are O(1)
+        self._total_bytes: int = 0
+        self._bytes_by_owner: Dict[Optional[str], int] = {}
+        # Free-list of deleted pool-made buffers
+        self.recycle_limit = max(0, int(recycle_limit))
+        self._free = ObjectPool(DataBuffer.unchecked, limit=self.recycle_limit)
 
     # Core operations
     def register(self, buffer: DataBuffer, owner: Optional[str] = None) -> DataBuffer:
         if buffer.id not in self._buffers:
             self._buffers[buffer.id] = buffer
-        # Assign owner
-        self.set_owner(buffer.id, owner)
-        if owner:
-            buffer.owner_memory = owner
+            self._total_bytes += buffer.size
+            # Index under the buffer's current owner; set_owner below moves it if needed
+            buffer.owner_memory = self._add_owned(buffer.owner_memory, buffer.id, buffer.size)
+        # Assign owner (an ownerless registration keeps the buffer's owner_memory)
+        if owner is not None:
+            self.set_owner(buffer.id, owner)
         return self._buffers[buffer.id]
 
-    def create(self, size: int, content: Optional[bytes] = None, owner: Optional[str] = None) -> DataBuffer:
-        buf = DataBuffer(size=size, content=content)
+    def register_in_transit(self, sim, buffer: DataBuffer, owner: Optional[str] = None) -> DataBuffer:
+        """register() a freshly produced buffer and move it through "allocated" to "transit"."""
+        buf = self.register(buffer, owner=owner)
+        if buf.triggers or buf.id in self._triggers:
+            # Entry triggers for both states still fire, in order
+            self.set_state(sim, buf.id, "allocated")
+            self.set_state(sim, buf.id, "transit")
+        else:
+            buf.state = "transit"
+        return buf
+
+    def create(
+        self,
+        size: int,
+        content: Optional[bytes] = None,
+        owner: Optional[str] = None,
+        role: str = BufferRoles.SOURCE,
+    ) -> DataBuffer:
+        if size <= 0:
+            raise ValueError("DataBuffer.size must be > 0")
+        buf = self._alloc(size, content=content, role=role)
         return self.register(buf, owner=owner)
 
-    def get(self, buffer_id: str) -> Optional[DataBuffer]:
+    def _alloc(self, size: int, **fields: Any) -> DataBuffer:
+        return self._free.acquire(size, **fields)
+
+    def get(self, buffer_id: int) -> Optional[DataBuffer]:
         return self._buffers.get(buffer_id)
 
-    def exists(self, buffer_id: str) -> bool:
+    def exists(self, buffer_id: int) -> bool:
         return buffer_id in self._buffers
 
-    def owner(self, buffer_id: str) -> Optional[str]:
-        return self._owner_of.get(buffer_id)
+    def owner(self, buffer_id: int) -> Optional[str]:
+        buf = self._buffers.get(buffer_id)
+        return buf.owner_memory if buf is not None else None
 
-    def set_owner(self, buffer_id: str, owner: Optional[str]) -> None:
-        prev = self._owner_of.get(buffer_id)
-        if prev == owner and buffer_id in self._buffers:
+    def set_owner(self, buffer_id: int, owner: Optional[str]) -> None:
+        buf = self._buffers.get(buffer_id)
+        if buf is None:
+            return
+        prev = buf.owner_memory
+        if prev == owner:
             return
-        # Remove from previous owner set
-        if prev in self._owned_by:
-            self._owned_by[prev].discard(buffer_id)
-        # Assign new owner
-        self._owner_of[buffer_id] = owner
-        self._owned_by.setdefault(owner, set()).add(buffer_id)
-
-    def transfer(self, buffer_id: str, new_owner: Optional[str]) -> None:
+        self._discard_owned(prev, buffer_id, buf.size)
+        buf.owner_memory = self._add_owned(owner, buffer_id, buf.size)
+
+    def _add_owned(self, owner: Optional[str], buffer_id: int, size: int) -> Optional[str]:
+        if owner is not None:
+            owner = sys.intern(owner)
+        owned = self._owned_by.setdefault(owner, set())
+        if buffer_id not in owned:
+            owned.add(buffer_id)
+            self._bytes_by_owner[owner] = self._bytes_by_owner.get(owner, 0) + size
+        return owner
+
+    def _discard_owned(self, owner: Optional[str], buffer_id: int, size: int) -> None:
+        owned = self._owned_by.get(owner)
+        if owned and buffer_id in owned:
+            owned.remove(buffer_id)
+            self._bytes_by_owner[owner] -= size
+
+    def transfer(self, buffer_id: int, new_owner: Optional[str]) -> None:
         if buffer_id not in self._buffers:
             raise KeyError(f"Unknown buffer id: {buffer_id}")
         self.set_owner(buffer_id, new_owner)
 
-    def delete(self, buffer_id: str) -> Optional[DataBuffer]:
+    def delete(self, buffer_id: int) -> Optional[DataBuffer]:
         buf = self._buffers.pop(buffer_id, None)
         if buf is not None:
-            owner = self._owner_of.pop(buffer_id, None)
-            if owner in self._owned_by:
-                self._owned_by[owner].discard(buffer_id)
+            self._total_bytes -= buf.size
+            self._discard_owned(buf.owner_memory, buffer_id, buf.size)
             # Remove triggers tracking
             self._triggers.pop(buffer_id, None)
+            self._attached.pop(buffer_id, None)
             self._expected_arrival.pop(buffer_id, None)
             self._transfer_meta.pop(buffer_id, None)
+            # Only pool-made buffers go back on the free-list
+            self._free.release(buf)
         return buf
 
     # Accounting
     def bytes_owned(self, owner: Optional[str]) -> int:
-        total = 0
-        for bid in self._owned_by.get(owner, set()):
-            b = self._buffers.get(bid)
-            if b is not None:
-                total += b.size
-        return total
+        return self._bytes_by_owner.get(owner, 0)
 
     def total_bytes(self) -> int:
-        return sum(b.size for b in self._buffers.values())
+        return self._total_bytes
 
     # Triggers and state handling
-    def set_triggers(self, buffer_id: str, triggers: List[Dict[str, Any]]) -> None:
-        self._triggers[buffer_id] = list(triggers)
+    def set_triggers(self, buffer_id: int, triggers: List[Dict[str, Any]]) -> None:
+        self._triggers.pop(buffer_id, None)
+        for trig in triggers:
+            self.add_trigger(buffer_id, trig)
 
-    def add_trigger(self, buffer_id: str, trigger: Dict[str, Any]) -> None:
-        self._triggers.setdefault(buffer_id, []).append(trigger)
+    def add_trigger(self, buffer_id: int, trigger: Dict[str, Any]) -> None:
+        parsed = parse_trigger(trigger)
+        self._triggers.setdefault(buffer_id, {}).setdefault(parsed.on, []).append(parsed)
 
-    def set_state(self, sim, buffer_id: str, state: str) -> None:
+    def set_state(self, sim, buffer_id: int, state: str) -> None:
         buf = self._buffers.get(buffer_id)
         if buf is None:
             return
         buf.state = state
         if sim is None:
             return
-        # Collect triggers from pool and from buffer itself
-        trig_list: List[Dict[str, Any]] = []
-        if buffer_id in self._triggers:
-            trig_list.extend(self._triggers[buffer_id])
-        if getattr(buf, "triggers", None):
-            trig_list.extend(buf.triggers)
-        if not trig_list:
+        by_state = self._triggers.get(buffer_id)
+        trigs = by_state.get(state) if by_state else None
+        if buf.triggers:
+            attached = self._attached_triggers(buf).get(state)
+            if attached:
+                trigs = trigs + attached if trigs else attached
+        if not trigs:
             return
-        # Fire matching triggers
-        for trig in trig_list:
-            try:
-                if str(trig.get("on")) != state:
+        # Fire matching triggers, grouping messages per station for one delivery each
+        batches: Dict[str, Tuple[Any, List[Message]]] = {}
+        resources = sim.topology.resources
+        now = sim.ticks
+        for trig in trigs:
+            station = trig.station
+            batch = batches.get(station)
+            if batch is None:
+                # Lookup station resource once per station
+                target = resources.get(station)
+                if target is None:
                     continue
-                action = str(trig.get("action"))
-                station = str(trig.get("station"))
-                index = int(trig.get("index"))
-            except Exception:
-                continue
-            # Lookup station resource and deliver a semaphore op
-            target = sim.topology.resources.get(station)
-            if target is None:
-                continue
-            kind = "sem_signal" if action == "signal" else "sem_wait"
-            msg = Message(
+                batch = batches[station] = (target, [])
+            msg = sim.message_pool.acquire(
                 src="buffer_pool",
                 dst=station,
                 size=1,
-                kind=kind,
-                payload={"index": index, "buffer_id": buffer_id, "state": state},
-                created_at=sim.ticks,
+                kind=trig.kind,
+                payload={"index": trig.index, "buffer_id": buffer_id, "state": state},
+                created_at=now,
             )
-            sim.deliver(target, "in", msg)
+            batch[1].append(msg)
+        for target, msgs in batches.values():
+            sim.deliver_many(target, "in", msgs)
+
+    def _attached_triggers(self, buf: DataBuffer) -> Dict[str, List[Trigger]]:
+        """Parsed buf.triggers, cached until the list is replaced or edited."""
+        raw = buf.triggers
+        cached = self._attached.get(buf.id)
+        if cached is not None and cached[0] is raw and cached[1] == raw:
+            return cached[2]
+        by_state = _parse_attached(raw)
+        snapshot = [dict(t) if isinstance(t, dict) else t for t in raw]
+        self._attached[buf.id] = (raw, snapshot, by_state)
+        return by_state
 
     # Scheduling helpers
-    def record_expected_arrival(self, buffer_id: str, tick: int) -> None:
-        self._expected_arrival[buffer_id] = int(tick)
+    def record_expected_arrival(self, buffer_id: int, tick: int) -> None:
+        tick = int(tick)
+        # An unchanged estimate already has a live heap entry
+        if self._expected_arrival.get(buffer_id) == tick:
+            return
+        self._expected_arrival[buffer_id] = tick
+        heapq.heappush(self._arrival_heap, (tick, isinstance(buffer_id, str), buffer_id))
+
+    def record_expected_arrivals(self, items: List[Tuple[int, int]]) -> None:
+        """Batch form of record_expected_arrival for (buffer_id, tick) pairs."""
+        expected = self._expected_arrival
+        heap = self._arrival_heap
+        for bid, tick in items:
+            if expected.get(bid) != tick:
+                expected[bid] = tick
+                heapq.heappush(heap, (tick, isinstance(bid, str), bid))
 
     def tick(self, sim) -> None:
-        # Transition buffers whose expected arrival is due
-        due = [bid for bid, t in list(self._expected_arrival.items()) if t <= sim.ticks]
-        for bid in due:
+        # Transition buffers whose expected arrival is due; pop only due heap entries
+        heap = self._arrival_heap
+        expected = self._expected_arrival
+        now = sim.ticks
+        while heap and heap[0][0] <= now:
+            t, _, bid = heapq.heappop(heap)
+            if expected.get(bid) != t:
+                # Rescheduled or cancelled since this entry was pushed
+                continue
             meta = self._transfer_meta.get(bid, {})
             src_id = meta.get("source_id")
             dest_pe = meta.get("destination_pe")
@@ -157,16 +290,16 @@ class BufferPool:
                 pe = sim.topology.resources.get(dest_pe)
                 if pe is not None:
                     try:
-                        pe.in_queue(dest_queue).append(self._buffers.get(bid))
+                        sim.deliver(pe, dest_queue, self._buffers.get(bid))
                     except Exception:
                         pass
-            self._expected_arrival.pop(bid, None)
+            expected.pop(bid, None)
 
     # Transfer API
     def schedule_transfer(
         self,
         sim,
-        src_buffer_id: str,
+        src_buffer_id: int,
         dst_memory: str,
         dst_pe: Optional[str] = None,
         dst_queue: str = "in0",
@@ -175,15 +308,13 @@ class BufferPool:
         src = self._buffers.get(src_buffer_id)
         if src is None:
             return None
-        dest = DataBuffer(
-            size=src.size,
+        dest = self._alloc(
+            src.size,
             content=src.content,
             owner_memory=dst_memory,
             role=BufferRoles.DEST,
             destination_pe=dst_pe,
             destination_queue=dst_queue,
-            bytes_received=0,
-            bytes_sent=0,
         )
         self.register(dest, owner=dst_memory)
         self.set_state(sim, buffer_id=src_buffer_id, state=BufferStates.TRANSIT)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import math
+from typing import Optional
+
 from ..core.resource import Resource
 
 
@@ -15,6 +16,17 @@ class Channel(Resource):
     helpers to estimate transfer time for a payload of given size.
     """
 
+    __slots__ = (
+        "bandwidth",
+        "latency",
+        "transfer_mode",
+        "_ticks",
+        "_busy_ticks",
+        "_active_count",
+        "_last_finalized_tick",
+        "_backpressured",
+    )
+
     def __init__(self, name: str, bandwidth: int = 128, latency: int = 5, transfer_mode: str = "interleaving") -> None:
         super().__init__(name)
         if bandwidth <= 0:
@@ -41,8 +53,9 @@ class Channel(Resource):
         if bw <= 0:
             # Effectively stalled; return a large placeholder
             return 10**9
-        data_ticks = math.ceil(max(1, size) / bw)
-        return max(0, self.latency) + data_ticks
+        # Integer ceil division; latency is validated >= 0 at construction
+        data_ticks = (size + bw - 1) // bw if size > 0 else 1
+        return self.latency + data_ticks
 
     @property
     def is_interleaving(self) -> bool:
@@ -64,20 +77,26 @@ class Channel(Resource):
         # active_count > 0 means the channel is currently in use this tick
         self._active_count = max(0, int(active_count))
 
+    def next_wakeup(self, sim) -> Optional[int]:
+        # The pass-through is input-driven; subclasses with their own tick()
+        # stay polled every tick unless they override this too
+        if type(self).tick is not Channel.tick:
+            return sim.ticks + 1
+        return sim.ticks + 1 if self.inbox.get("in") else None
+
     # Pass-through behavior: forward any messages from 'in' to 'out'
     def tick(self, sim) -> None:
         inq = self.inbox.get("in")
-        if inq is not None:
-            while inq:
-                self.send("out", inq.popleft())
+        if inq:
+            self.out_queue("out").extend(inq)
+            inq.clear()
 
     # Called by simulator at end of tick to fold occupancy stats
     def finalize_tick(self, sim) -> None:
         if self._last_finalized_tick == sim.ticks:
             return
         self._ticks += 1
-        if self._active_count > 0:
-            self._busy_ticks += 1
+        self._busy_ticks += self._active_count > 0
         self._last_finalized_tick = sim.ticks
 
     @property
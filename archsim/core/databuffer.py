@@ -2,10 +2,29 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
-from uuid import uuid4
+import itertools
 import os
 
 
+# Monotonic buffer ids: ints hash and compare cheaper than hex strings
+_buffer_ids = itertools.count(1)
+
+
+def _adopt_id(raw: Any) -> Any:
+    """
+    Buffer id for an imported buffer: a fresh one if raw is empty or 0 (ids
+    are never 0, so falsy-id checks stay valid), raw itself otherwise. Int ids move the generator past them so later pool-made
+    buffers cannot collide; other ids (e.g. legacy hex strings) stay opaque keys.
+    """
+    global _buffer_ids
+    if not raw:
+        return next(_buffer_ids)
+    if isinstance(raw, int) and not isinstance(raw, bool):
+        nxt = next(_buffer_ids)
+        _buffer_ids = itertools.count(max(nxt, raw + 1))
+    return raw
+
+
 class BufferStates:
     ALLOCATED = "allocated"
     TRANSIT = "transit"
@@ -14,24 +33,27 @@ class BufferStates:
     INUSE = "inuse"
     DEALLOCATED = "deallocated"
 
+    ALL = frozenset((ALLOCATED, TRANSIT, ARRIVED, RESPONDED, INUSE, DEALLOCATED))
+
 
 class BufferRoles:
     SOURCE = "source"
     DEST = "destination"
 
 
-@dataclass
+@dataclass(slots=True)
 class DataBuffer:
     """
     Abstract data unit moved between memories over buses/links.
 
     - size: total bytes to transfer
-    - content: backing bytes (optional). Defaults to random bytes of length `size`.
+    - content: backing bytes (optional). Left as None by default; random bytes
+      of length `size` are materialized lazily on first `content_bytes` access.
     """
 
     size: int
     content: Optional[bytes] = None
-    id: str = field(default_factory=lambda: f"buf-{uuid4().hex[:8]}")
+    id: int = field(default_factory=lambda: next(_buffer_ids))
     state: str = BufferStates.ALLOCATED
     # Ownership and role metadata
     owner_memory: Optional[str] = None
@@ -44,20 +66,57 @@ class DataBuffer:
     # Optional transition triggers: list of dicts like
     # {"on": "arrived", "action": "signal"|"wait", "station": "sem", "index": 0}
     triggers: List[Dict[str, Any]] = field(default_factory=list)
+    # ObjectPool that handed this buffer out, if any (see ObjectPool.release)
+    _pool: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.size <= 0:
             raise ValueError("DataBuffer.size must be > 0")
+
+    @classmethod
+    def unchecked(
+        cls,
+        size: int,
+        content: Optional[bytes] = None,
+        owner_memory: Optional[str] = None,
+        role: str = BufferRoles.SOURCE,
+        destination_pe: Optional[str] = None,
+        destination_queue: Optional[str] = None,
+    ) -> "DataBuffer":
+        """Build a buffer without running __init__/validation (e.g., clones of a validated source)."""
+        buf = cls.__new__(cls)
+        buf._pool = None
+        buf.reinit(size, content, owner_memory, role, destination_pe, destination_queue)
+        return buf
+
+    def reinit(
+        self,
+        size: int,
+        content: Optional[bytes] = None,
+        owner_memory: Optional[str] = None,
+        role: str = BufferRoles.SOURCE,
+        destination_pe: Optional[str] = None,
+        destination_queue: Optional[str] = None,
+    ) -> None:
+        """Reset every field in place under a fresh id (used for free-list reuse)."""
+        self.size = size
+        self.content = content
+        self.id = next(_buffer_ids)
+        self.state = BufferStates.ALLOCATED
+        self.owner_memory = owner_memory
+        self.role = role
+        self.destination_pe = destination_pe
+        self.destination_queue = destination_queue
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.triggers = []
+
+    @property
+    def content_bytes(self) -> bytes:
         if self.content is None:
-            # Random bytes; avoid excessive memory for very large sizes by capping generation
-            # Users can supply content explicitly for large buffers if needed.
-            cap = min(self.size, 1_000_000)  # cap generation to 1MB for safety
-            payload = os.urandom(cap)
-            if cap < self.size:
-                # Pad logically without storing full content
-                self.content = payload + bytes(self.size - cap)
-            else:
-                self.content = payload
+            # Generated only on explicit request, so no size cap is needed
+            self.content = os.urandom(self.size)
+        return self.content
 
     def to_dict(self) -> dict:
         return {
@@ -76,35 +135,38 @@ class DataBuffer:
 
     @staticmethod
     def from_dict(d: dict) -> "DataBuffer":
-        buf = DataBuffer(
-            size=int(d["size"]),
-            content=d.get("content"),
-            id=d.get("id") or f"buf-{uuid4().hex[:8]}",
-        )
-        if "state" in d:
-            buf.state = str(d["state"])  # trust input
-        if "owner_memory" in d:
-            buf.owner_memory = d.get("owner_memory")
-        if "role" in d:
-            buf.role = str(d.get("role"))
-        if "destination_pe" in d:
-            buf.destination_pe = d.get("destination_pe")
-        if "destination_queue" in d:
-            buf.destination_queue = d.get("destination_queue")
-        if "bytes_received" in d:
-            buf.bytes_received = int(d.get("bytes_received", 0))
-        if "bytes_sent" in d:
-            buf.bytes_sent = int(d.get("bytes_sent", 0))
-        if "triggers" in d and isinstance(d["triggers"], list):
-            buf.triggers = list(d["triggers"])  # shallow copy
+        size = int(d["size"])
+        if size <= 0:
+            raise ValueError("DataBuffer.size must be > 0")
+        # Fill slots directly; avoids __init__ plus a second pass of overrides
+        buf = DataBuffer.__new__(DataBuffer)
+        buf._pool = None
+        get = d.get
+        buf.size = size
+        buf.content = get("content")
+        buf.id = _adopt_id(get("id"))
+        buf.state = str(d["state"]) if "state" in d else BufferStates.ALLOCATED  # trust input
+        buf.owner_memory = get("owner_memory")
+        buf.role = str(get("role")) if "role" in d else BufferRoles.SOURCE
+        buf.destination_pe = get("destination_pe")
+        buf.destination_queue = get("destination_queue")
+        buf.bytes_received = int(get("bytes_received", 0))
+        buf.bytes_sent = int(get("bytes_sent", 0))
+        trig = get("triggers")
+        buf.triggers = list(trig) if isinstance(trig, list) else []  # shallow copy
         return buf
 
     @property
     def buffering_size(self) -> int:
-        return max(0, self.bytes_received - self.bytes_sent)
+        n = self.bytes_received - self.bytes_sent
+        return n if n > 0 else 0
 
+    # Clamp to [0, size] with comparisons rather than min()/max() calls;
+    # these run once per transferred chunk
     def add_received(self, amount: int) -> None:
-        self.bytes_received = min(self.size, max(0, self.bytes_received + amount))
+        n = self.bytes_received + amount
+        self.bytes_received = 0 if n < 0 else (self.size if n > self.size else n)
 
     def add_sent(self, amount: int) -> None:
-        self.bytes_sent = min(self.size, max(0, self.bytes_sent + amount))
+        n = self.bytes_sent + amount
+        self.bytes_sent = 0 if n < 0 else (self.size if n > self.size else n)
@@ -4,6 +4,10 @@ from collections import deque
 from typing import Deque, Optional
 
 
+def _no_wake() -> None:
+    pass
+
+
 class Link:
     def __init__(
         self,
@@ -26,65 +30,106 @@ class Link:
         self.bandwidth = bandwidth
         self.latency = latency
         self.name = name or f"{src.name}:{src_port}->{dst.name}:{dst_port}"
+        # Port deques are created once and never replaced, so hold them directly
+        self._src_outq: Deque = src.out_queue(src_port)
+        self._dst_inq: Deque = dst.in_queue(dst_port)
+        # Duck-typed destinations never sleep, so there is nothing to wake
+        self._wake_dst = getattr(dst, "wake", None) or _no_wake
 
-        # Pipeline stages: stage 0 is the stage that accepts from src this tick
-        # After tick, data in stage i moves to i+1; stage (latency) delivers
+        # Pipeline stages as a ring: each tick the head stage delivers, then
+        # accepts from src; it comes back around `latency` ticks later
         self.pipeline: list[Deque] = [deque() for _ in range(max(1, latency))]
+        self._head: int = 0
+        self._stages: int = len(self.pipeline)
+        # Messages currently held in the pipeline stages
+        self._in_flight: int = 0
 
         # Basic accounting
         self.bytes_moved_this_tick: int = 0
         self.utilization_sum: int = 0
         self.ticks: int = 0
 
-    def tick(self, sim) -> None:
-        self.ticks += 1
-        self.bytes_moved_this_tick = 0
+        # Latency is fixed, so bind the matching tick variant once
+        self.tick = self._tick_pipeline if latency >= 1 else self._tick_immediate
 
-        # Delivery if latency >= 1
+    def tick(self, sim) -> None:
+        # Replaced per instance in __init__ by the variant matching latency
         if self.latency >= 1:
-            last = self.pipeline[-1]
-            while last:
-                msg = last.popleft()
-                sim.deliver(self.dst, self.dst_port, msg)
-                self.bytes_moved_this_tick += msg.size
-                sim.metrics.messages_delivered += 1
-                sim.metrics.bytes_transferred += msg.size
-
-            # Shift pipeline forward
-            for i in range(len(self.pipeline) - 1, 0, -1):
-                prev = self.pipeline[i - 1]
-                cur = self.pipeline[i]
-                while prev:
-                    cur.append(prev.popleft())
-
-            # Now stage 0 is empty and ready to accept
-            # Pull from src outbox subject to bandwidth
-            capacity = self.bandwidth
-            # Apply backpressure if destination signals it
-            if getattr(self.dst, "backpressured", False):
-                capacity = 0
-            outq = self.src.outbox.get(self.src_port)
-            if outq is not None:
-                while outq and capacity >= getattr(outq[0], "size", 1):
-                    msg = outq.popleft()
-                    self.pipeline[0].append(msg)
-                    capacity -= getattr(msg, "size", 1)
+            self._tick_pipeline(sim)
         else:
-            # latency == 0: deliver immediately subject to bandwidth
+            self._tick_immediate(sim)
+
+    def _tick_pipeline(self, sim) -> None:
+        # latency >= 1: head stage delivers, then refills from src
+        self.ticks += 1
+        outq = self._src_outq
+        if not outq and not self._in_flight:
+            # Idle: nothing staged and nothing to admit
+            self.bytes_moved_this_tick = 0
+            return
+        dst = self.dst
+        delivered = 0
+        moved = 0
+
+        stage = self.pipeline[self._head]
+        if stage:
+            for msg in stage:
+                moved += msg.size
+            self._dst_inq.extend(stage)
+            self._wake_dst()
+            delivered = len(stage)
+            self._in_flight -= delivered
+            sim._in_flight -= delivered
+            stage.clear()
+
+        # Head stage is now empty and ready to accept; advance the ring
+        self._head = (self._head + 1) % self._stages
+        # Pull from src outbox subject to bandwidth; none under backpressure
+        if outq and not getattr(dst, "backpressured", False):
             capacity = self.bandwidth
-            if getattr(self.dst, "backpressured", False):
-                capacity = 0
-            outq = self.src.outbox.get(self.src_port)
-            if outq is not None:
-                while outq and capacity >= getattr(outq[0], "size", 1):
-                    msg = outq.popleft()
-                    sim.deliver(self.dst, self.dst_port, msg)
-                    capacity -= getattr(msg, "size", 1)
-                    self.bytes_moved_this_tick += msg.size
-                    sim.metrics.messages_delivered += 1
-                    sim.metrics.bytes_transferred += msg.size
-
-        self.utilization_sum += self.bytes_moved_this_tick
+            popleft = outq.popleft
+            append = stage.append
+            while outq and capacity >= outq[0].size:
+                msg = popleft()
+                append(msg)
+                capacity -= msg.size
+            admitted = len(stage)
+            self._in_flight += admitted
+            sim._in_flight += admitted
+
+        self.bytes_moved_this_tick = moved
+        self.utilization_sum += moved
+        if delivered:
+            metrics = sim.metrics
+            metrics.messages_delivered += delivered
+            metrics.bytes_transferred += moved
+
+    def _tick_immediate(self, sim) -> None:
+        # latency == 0: deliver immediately subject to bandwidth
+        self.ticks += 1
+        outq = self._src_outq
+        if not outq or getattr(self.dst, "backpressured", False):
+            self.bytes_moved_this_tick = 0
+            return
+        capacity = self.bandwidth
+        moved = 0
+        popleft = outq.popleft
+        batch = []
+        append = batch.append
+        while outq and capacity >= outq[0].size:
+            msg = popleft()
+            append(msg)
+            capacity -= msg.size
+            moved += msg.size
+
+        self.bytes_moved_this_tick = moved
+        self.utilization_sum += moved
+        if batch:
+            self._dst_inq.extend(batch)
+            self._wake_dst()
+            metrics = sim.metrics
+            metrics.messages_delivered += len(batch)
+            metrics.bytes_transferred += moved
 
     @property
     def utilization(self) -> float:
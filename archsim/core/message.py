@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import itertools
 from dataclasses import dataclass, field
 from typing import Any, Optional
-from uuid import uuid4
 
 
-@dataclass
+_message_ids = itertools.count(1)
+
+
+def _new_message_id() -> str:
+    # Process-local identity tag; a counter avoids a urandom call per message
+    return f"msg-{next(_message_ids):08x}"
+
+
+@dataclass(slots=True)
 class Message:
     src: str
     dst: str
@@ -13,10 +21,34 @@ class Message:
     kind: str = "data"  # e.g., 'read', 'write', 'resp', 'data'
     payload: Optional[Any] = None
     created_at: int = 0
-    id: str = field(default_factory=lambda: f"msg-{uuid4().hex[:8]}")
+    id: str = field(default_factory=_new_message_id)
     reply_to: Optional[str] = None
+    # ObjectPool that handed this message out, if any (see ObjectPool.release)
+    _pool: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.size <= 0:
             raise ValueError("Message.size must be > 0")
 
+    def reinit(
+        self,
+        src: str,
+        dst: str,
+        size: int = 1,
+        kind: str = "data",
+        payload: Optional[Any] = None,
+        created_at: int = 0,
+        reply_to: Optional[str] = None,
+    ) -> None:
+        """Reset every field in place under a fresh id (used for free-list reuse)."""
+        if size <= 0:
+            raise ValueError("Message.size must be > 0")
+        self.src = src
+        self.dst = dst
+        self.size = size
+        self.kind = kind
+        self.payload = payload
+        self.created_at = created_at
+        self.id = _new_message_id()
+        self.reply_to = reply_to
+
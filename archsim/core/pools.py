@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Deque, Iterable
+
+
+class ObjectPool:
+    """
+    Bounded free-list of reusable objects.
+
+    - factory(*args, **kwargs) builds a new object when the free-list is empty.
+    - Pooled objects must implement reinit(*args, **kwargs), which resets every
+      field in place; acquire() calls it on reused objects.
+    - release() returns an object for reuse. Callers must not keep references to
+      released objects.
+    - Objects carry a `_pool` tag naming the pool that handed them out;
+      release() ignores objects this pool did not acquire (caller-built ones,
+      another pool's, or ones already released), so it is safe on any object.
+    """
+
+    def __init__(self, factory: Callable[..., Any], limit: int = 4096) -> None:
+        self._factory = factory
+        self.limit = max(0, int(limit))
+        self._free: Deque[Any] = deque()
+
+    def acquire(self, *args: Any, **kwargs: Any) -> Any:
+        if self._free:
+            obj = self._free.pop()
+            obj.reinit(*args, **kwargs)
+        else:
+            obj = self._factory(*args, **kwargs)
+        obj._pool = self
+        return obj
+
+    def release(self, obj: Any) -> None:
+        if obj._pool is self:
+            obj._pool = None
+            if len(self._free) < self.limit:
+                self._free.append(obj)
+
+    def release_many(self, objs: Iterable[Any]) -> None:
+        free = self._free
+        room = self.limit - len(free)
+        for obj in objs:
+            if obj._pool is self:
+                obj._pool = None
+                if room > 0:
+                    free.append(obj)
+                    room -= 1
+
+    def __len__(self) -> int:
+        return len(self._free)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import itertools
 from collections import deque
 from typing import Deque, Optional, Tuple
-from uuid import uuid4
 
 from .databuffer import DataBuffer
 
+_queue_ids = itertools.count(1)
+
 
 class BaseQueue:
     def __init__(self, parent: str, direction: str, function: str):
@@ -14,7 +16,7 @@ class BaseQueue:
         self.parent = parent
         self.direction = direction
         self.function = function
-        self.uid = f"q-{uuid4().hex[:8]}"
+        self.uid = f"q-{next(_queue_ids):08x}"
         self.items: Deque = deque()
 
     @property
@@ -42,41 +44,58 @@ class InputQueue(BaseQueue):
     pass
 
 
+class Transfer:
+    """Pending buffer transfer queued on an OutputQueue."""
+
+    __slots__ = ("buf", "dst_mem", "dst_pe", "dst_q")
+
+    def __init__(self, buf: DataBuffer, dst_mem: str, dst_pe: Optional[str] = None, dst_q: str = "in0") -> None:
+        self.buf = buf
+        self.dst_mem = dst_mem
+        self.dst_pe = dst_pe
+        self.dst_q = dst_q
+
+
 class OutputQueue(BaseQueue):
     """
     Output queue that can schedule buffer transfers to a destination.
-    Items are (DataBuffer, dst_memory, dst_pe, dst_queue).
+    Transfer items are queued via enqueue_transfer().
     If a channel is provided, chunk transmission respects its current bandwidth.
     """
 
     def __init__(self, parent: str, function: str):
         super().__init__(parent=parent, direction="out", function=function)
-        self._scheduled: set[str] = set()
-        self._dest_map: dict[str, Optional[str]] = {}
+        self._scheduled: set[int] = set()
+        self._dest_map: dict[int, Optional[int]] = {}
 
     def enqueue_transfer(self, buf: DataBuffer, dst_memory: str, dst_pe: Optional[str] = None, dst_queue: str = "in0") -> None:
-        self.enqueue((buf, dst_memory, dst_pe, dst_queue))
+        if not isinstance(buf, DataBuffer):
+            raise TypeError("OutputQueue.enqueue_transfer expects a DataBuffer")
+        self.items.append(Transfer(buf, dst_memory, dst_pe, dst_queue))
 
     def step(self, sim, channel=None) -> None:
-        if not self.items:
+        items = self.items
+        if not items:
             return
-        head = self.items[0]
-        if not isinstance(head, tuple) or len(head) < 2:
-            return
-        buf, dst_mem, dst_pe, dst_q = head
-        if not isinstance(buf, DataBuffer):
+        head = items[0]
+        # items may alias a resource outbox that also carries Messages
+        if head.__class__ is not Transfer:
             return
+        buf = head.buf
+        bid = buf.id
+        pool = sim.buffer_pool
         # Register destination if not already scheduled
-        if buf.id not in self._scheduled:
-            dest = sim.buffer_pool.schedule_transfer(sim, buf.id, dst_mem, dst_pe=dst_pe, dst_queue=dst_q)
-            self._dest_map[buf.id] = getattr(dest, "id", None) if dest else None
-            self._scheduled.add(buf.id)
+        if bid not in self._scheduled:
+            dest = pool.schedule_transfer(sim, bid, head.dst_mem, dst_pe=head.dst_pe, dst_queue=head.dst_q)
+            self._dest_map[bid] = dest.id if dest is not None else None
+            self._scheduled.add(bid)
             # Assume source is fully available to send; mark received
             if buf.bytes_received < buf.size:
                 buf.add_received(buf.size - buf.bytes_received)
 
         # If channel is backpressured or has zero capacity, wait
         capacity = None
+        latency = 0
         if channel is not None:
             if hasattr(channel, "current_bandwidth"):
                 capacity = channel.current_bandwidth
@@ -84,6 +103,7 @@ class OutputQueue(BaseQueue):
                 capacity = getattr(channel, "bandwidth", None)
             if capacity is not None and capacity <= 0:
                 return
+            latency = getattr(channel, "latency", 0)
 
         buffering = buf.buffering_size
         if buffering <= 0:
@@ -97,10 +117,8 @@ class OutputQueue(BaseQueue):
 
         # If we've sent the entire buffer, record expected arrival and dequeue
         if buf.bytes_sent >= buf.size:
-            dest_id = self._dest_map.get(buf.id)
+            dest_id = self._dest_map.pop(bid, None)
             if dest_id:
-                arrival = sim.ticks + (getattr(channel, "latency", 0) if channel is not None else 0)
-                sim.buffer_pool.record_expected_arrival(dest_id, arrival)
-            self.items.popleft()
-            self._scheduled.discard(buf.id)
-            self._dest_map.pop(buf.id, None)
+                pool.record_expected_arrival(dest_id, sim.ticks + latency)
+            items.popleft()
+            self._scheduled.discard(bid)
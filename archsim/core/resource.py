@@ -4,16 +4,67 @@ from collections import deque
 from typing import Deque, Dict, Iterable, Optional
 
 
+class _Inbox(deque):
+    """Input port deque that wakes its resource whenever messages are added."""
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: "Resource") -> None:
+        super().__init__()
+        self._owner = owner
+
+    def append(self, x) -> None:
+        deque.append(self, x)
+        self._owner._wake_tick = 0
+
+    def appendleft(self, x) -> None:
+        deque.appendleft(self, x)
+        self._owner._wake_tick = 0
+
+    def extend(self, xs) -> None:
+        deque.extend(self, xs)
+        self._owner._wake_tick = 0
+
+    def extendleft(self, xs) -> None:
+        deque.extendleft(self, xs)
+        self._owner._wake_tick = 0
+
+    def insert(self, i, x) -> None:
+        deque.insert(self, i, x)
+        self._owner._wake_tick = 0
+
+    def __iadd__(self, xs):
+        self.extend(xs)
+        return self
+
+    def __copy__(self):
+        q = self.__class__(self._owner)
+        deque.extend(q, self)
+        return q
+
+    def __reduce__(self):
+        # deque's own reduce would rebuild without the owner
+        return (self.__class__, (self._owner,), None, iter(self))
+
+
 class Resource:
+    # Declared attributes live in slots (subclasses list theirs in __slots__);
+    # the "__dict__" slot keeps ad-hoc attributes working for scripts and subclasses
+    __slots__ = ("name", "inbox", "outbox", "_wake_tick", "__dict__")
+
     def __init__(self, name: str):
         self.name = name
         self.inbox: Dict[str, Deque] = {}
         self.outbox: Dict[str, Deque] = {}
+        # Simulator skips tick() while sim.ticks < _wake_tick; adding to an
+        # inbox port or calling wake() resets it. Only resources defining
+        # next_wakeup(sim) ever move it past 0.
+        self._wake_tick: int = 0
 
     # Port management
     def add_port(self, port: str, direction: str = "both") -> None:
-        if direction in ("in", "both"):
-            self.inbox.setdefault(port, deque())
+        if direction in ("in", "both") and port not in self.inbox:
+            self.inbox[port] = _Inbox(self)
         if direction in ("out", "both"):
             self.outbox.setdefault(port, deque())
 
@@ -36,20 +87,41 @@ class Resource:
     def send(self, port: str, msg) -> None:
         self.outbox.setdefault(port, deque()).append(msg)
 
+    def send_many(self, port: str, msgs) -> None:
+        self.outbox.setdefault(port, deque()).extend(msgs)
+
     def out_queue(self, port: str) -> Deque:
         return self.outbox.setdefault(port, deque())
 
     def in_queue(self, port: str) -> Deque:
-        return self.inbox.setdefault(port, deque())
+        q = self.inbox.get(port)
+        if q is None:
+            q = self.inbox[port] = _Inbox(self)
+        return q
+
+    def wake(self) -> None:
+        """Have the simulator tick this resource again from the current tick on."""
+        self._wake_tick = 0
 
     # Default behavior: pass-through from same-named in->out
     def on_receive(self, port: str, msg, sim) -> None:
         if port in self.outbox:
             self.send(port, msg)
 
+    def _tick_callable(self):
+        # What the simulator calls each tick; resolved once when the topology
+        # is rebuilt. Subclasses with a fixed mode may return a specialized method.
+        return self.tick
+
     def tick(self, sim) -> None:
+        # Idle fast path: skip the items() snapshot when every inbox is empty
+        for q in self.inbox.values():
+            if q:
+                break
+        else:
+            return
+        on_receive = self.on_receive
         for port, q in list(self.inbox.items()):
             while q:
-                msg = q.popleft()
-                self.on_receive(port, msg, sim)
+                on_receive(port, q.popleft(), sim)
 
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import sys
 from typing import Optional
 
 from .topology import Topology
 from .buffer_pool import BufferPool
+from .message import Message
+from .pools import ObjectPool
 from ..metrics import Metrics
 
 
@@ -13,61 +16,98 @@ class Simulator:
         self.ticks = 0
         self.metrics = Metrics()
         self.buffer_pool = BufferPool()
+        # Per-simulation free-list of Messages: producers on hot paths acquire
+        # from it and terminal consumers release what they finish with
+        self.message_pool = ObjectPool(Message)
         self.topology.simulator = self
+        self._tracer: Optional[object] = None
         self.tracer = tracer
+        # Messages held in link pipelines across the whole topology
+        self._in_flight = 0
+
+    @property
+    def tracer(self) -> Optional[object]:
+        return self._tracer
+
+    @tracer.setter
+    def tracer(self, tracer: Optional[object]) -> None:
+        # Checked once here so the tick loop can call on_tick unguarded
+        if tracer is not None and not callable(getattr(tracer, "on_tick", None)):
+            raise TypeError("Simulator tracer must provide on_tick(sim)")
+        self._tracer = tracer
 
     def deliver(self, resource, port: str, msg) -> None:
+        # Inbox ports wake their resource on append
         resource.in_queue(port).append(msg)
 
+    def deliver_many(self, resource, port: str, msgs) -> None:
+        resource.in_queue(port).extend(msgs)
+
     def add_resources(self, *resources) -> None:
         self.topology.add(*resources)
 
     def tick(self) -> None:
-        # First, tick all resources
-        for r in list(self.topology.resources.values()):
-            r.tick(self)
+        # First, tick all resources; those exposing next_wakeup(sim) sleep
+        # until the tick it names or until something is delivered to them
+        topo = self.topology
+        now = self.ticks
+        for r, tick, next_wakeup in topo._tick_plan:
+            if next_wakeup is None:
+                # Never asleep (no next_wakeup, or not a Resource subclass)
+                tick(self)
+                continue
+            if r._wake_tick > now:
+                continue
+            tick(self)
+            wake = next_wakeup(self)
+            r._wake_tick = sys.maxsize if wake is None else wake
 
         # Then, tick all links to move data along
-        for link in self.topology.links:
+        for link in topo._links_tuple:
             link.tick(self)
 
         self.ticks += 1
         self.metrics.ticks = self.ticks
         # Buffer pool time-based updates (e.g., expected arrivals)
-        if hasattr(self, "buffer_pool") and self.buffer_pool is not None:
-            try:
-                self.buffer_pool.tick(self)
-            except Exception:
-                pass
-        # Finalize channel occupancy (if resources expose finalize_tick)
-        for r in list(self.topology.resources.values()):
-            finalize = getattr(r, "finalize_tick", None)
-            if callable(finalize):
-                try:
-                    finalize(self)
-                except Exception:
-                    pass
-        # Notify tracer after completing the tick
-        if self.tracer is not None and hasattr(self.tracer, "on_tick"):
-            try:
-                self.tracer.on_tick(self)
-            except Exception:
-                # Tracing should never break simulation
-                pass
+        if self.buffer_pool is not None:
+            self.buffer_pool.tick(self)
+        # Finalize channel occupancy (resources exposing finalize_tick)
+        for r in topo._finalizers:
+            r.finalize_tick(self)
+        # Notify tracer after completing the tick; the tracer setter checked
+        # on_tick, and tracers must not raise
+        tracer = self._tracer
+        if tracer is not None:
+            tracer.on_tick(self)
 
     def run(self, max_ticks: int = 1000, until_quiescent: bool = False) -> None:
+        if not until_quiescent:
+            self.run_n(max_ticks)
+            return
+        self.topology.freeze()
+        tick = self.tick
+        is_quiescent = self.is_quiescent
         for _ in range(max_ticks):
-            self.tick()
-            if until_quiescent and self.is_quiescent():
+            tick()
+            if is_quiescent():
                 break
 
+    def run_n(self, n: int) -> None:
+        """Advance exactly n ticks with no per-tick stop checks."""
+        self.topology.freeze()
+        tick = self.tick
+        for _ in range(n):
+            tick()
+
     def is_quiescent(self) -> bool:
-        # No messages in any in/out queues and no messages in links
-        for r in self.topology.resources.values():
-            for q in list(r.inbox.values()) + list(r.outbox.values()):
+        # No messages in links and no messages in any in/out queues
+        if self._in_flight:
+            return False
+        for r in self.topology._resources_tuple:
+            for q in r.inbox.values():
+                if q:
+                    return False
+            for q in r.outbox.values():
                 if q:
                     return False
-        for link in self.topology.links:
-            if any(stage for stage in link.pipeline):
-                return False
         return True
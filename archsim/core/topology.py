@@ -3,20 +3,58 @@ from __future__ import annotations
 from typing import Dict, List, Tuple
 
 from .link import Link
+from .channel import Channel
+from .resource import Resource
 
 
 class Topology:
     def __init__(self) -> None:
         self.resources: Dict[str, object] = {}
         self.links: List[Link] = []
+        # Channel resources, indexed at add() time for summaries/tracing
+        self.channels: List[Channel] = []
         self.queues: Dict[str, object] = {}
         self.coord_to_uid: Dict[str, str] = {}
+        # Immutable snapshots for the per-tick loops, rebuilt on add()/connect()
+        self._resources_tuple: Tuple[object, ...] = ()
+        self._links_tuple: Tuple[Link, ...] = ()
+        self._finalizers: Tuple[object, ...] = ()
+        # (resource, tick callable, next_wakeup or None) in tick order
+        self._tick_plan: Tuple[tuple, ...] = ()
+        # Set by freeze(); the structure is static for the rest of the run
+        self._frozen: bool = False
+
+    def freeze(self) -> None:
+        """Snapshot resources/links for the tick loop and forbid further changes."""
+        if self._frozen:
+            return
+        self._rebuild()
+        self._links_tuple = tuple(self.links)
+        self._frozen = True
 
     def add(self, *resources) -> None:
+        if self._frozen:
+            raise ValueError("Topology is frozen; cannot add resources")
         for r in resources:
             if r.name in self.resources:
                 raise ValueError(f"Resource with name '{r.name}' already exists")
             self.resources[r.name] = r
+            if isinstance(r, Channel):
+                self.channels.append(r)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._resources_tuple = tuple(self.resources.values())
+        self._finalizers = tuple(
+            r for r in self._resources_tuple if callable(getattr(r, "finalize_tick", None))
+        )
+        self._tick_plan = tuple(
+            (r, r._tick_callable(), getattr(r, "next_wakeup", None))
+            if isinstance(r, Resource)
+            # Duck-typed resources just tick every tick; they never sleep
+            else (r, r.tick, None)
+            for r in self._resources_tuple
+        )
 
     # Queue registry helpers
     def register_queue(self, queue) -> None:
@@ -50,11 +88,14 @@ class Topology:
         latency: int = 1,
         name: str | None = None,
     ) -> Link:
+        if self._frozen:
+            raise ValueError("Topology is frozen; cannot connect links")
         # Ensure ports exist
         src.add_port(src_port, direction="out")
         dst.add_port(dst_port, direction="in")
         link = Link(src, src_port, dst, dst_port, bandwidth=bandwidth, latency=latency, name=name)
         self.links.append(link)
+        self._links_tuple = tuple(self.links)
         return link
 
     def connect_by_name(
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from collections import deque
+from typing import Deque, List, Optional, Tuple
 
 from ..core.resource import Resource
 from ..core.channel import Channel
 from ..core.message import Message
+from ..core.databuffer import DataBuffer
+
+
+class _ActiveTransfer:
+    """One in-flight transfer sharing the downstream channel (interleaving mode)."""
+
+    __slots__ = ("port", "cell", "buf_id", "total", "progressed", "start", "last_update", "per_share_bw", "expected")
+
+    def __init__(self, port: str, cell: list, buf_id, total: int, now: int) -> None:
+        self.port = port
+        self.cell = cell  # the port's inflight cell, cleared when this finishes
+        self.buf_id = buf_id or None
+        self.total = total
+        self.progressed = 0
+        self.start = now
+        self.last_update = now
+        self.per_share_bw = 0
+        self.expected = now
 
 
 class Arbiter(Resource):
@@ -16,6 +35,9 @@ class Arbiter(Resource):
       round-robin across input ports each tick.
     - mode="scheduled": pick one input port with pending data and let it
       use the downstream fully until its queue drains, then switch.
+      After ``set_weight(port, quantum)`` the switch follows Deficit Round
+      Robin instead: a port keeps the downstream only while its byte
+      deficit covers the next message.
 
     Notes
     - This component shapes how messages are enqueued toward the downstream
@@ -25,6 +47,29 @@ class Arbiter(Resource):
       interleaving, use smaller message sizes or add a fragmentation stage.
     """
 
+    __slots__ = (
+        "mode",
+        "_inputs",
+        "_input_deques",
+        "_inflight_cells",
+        "_inputs_ring",
+        "_rr_index",
+        "_active_port",
+        "_active_q",
+        "_active_cell",
+        "_downstream",
+        "_available_from",
+        "_inflight_marked",
+        "_active",
+        "_expected_max",
+        "_published",
+        "_last_tick",
+        "_quanta",
+        "_deficits",
+        "_active_idx",
+        "_drr",
+    )
+
     def __init__(self, name: str, mode: str = "shared") -> None:
         super().__init__(name)
         if mode not in ("shared", "scheduled"):
@@ -32,156 +77,261 @@ class Arbiter(Resource):
         self.mode = mode
         self.add_port("out", direction="out")
         self._inputs: List[str] = []
+        # Inbox deques parallel to _inputs, captured at add_input() time
+        self._input_deques: List[Deque] = []
+        # One-element [inflight marker] cells parallel to _inputs; one outstanding
+        # transfer per initiator
+        self._inflight_cells: List[list] = []
+        # Round-robin ring of (port, inbox deque, inflight cell); head is served next
+        self._inputs_ring: Deque[Tuple[str, Deque, list]] = deque()
         self._rr_index: int = 0
         self._active_port: Optional[str] = None
+        self._active_q: Optional[Deque] = None
+        self._active_cell: Optional[list] = None
         # Scheduling against a downstream channel
         self._downstream: Optional[Channel] = None
         self._available_from: int = 0
-        # One outstanding per initiator; track active transfer per port
-        self._inflight_by_port: dict[str, Optional[str]] = {}
+        # Set when a blocking transfer marks a port, so the reset runs only then
+        self._inflight_marked: bool = False
         # Active transfers for interleaving schedule
-        # item: {port, buf_id, total, progressed, start, last_update, per_share_bw, expected}
-        self._active: list[dict] = []
+        self._active: List[_ActiveTransfer] = []
+        # Max expected tick over _active, kept current by compaction/recompute
+        self._expected_max: int = 0
+        # Last (active_count, expected_end) published to the downstream channel
+        self._published: Optional[tuple] = None
+        # Tick of the last tick() call; the RR ring catches up on ticks slept through
+        self._last_tick: Optional[int] = None
+        # Deficit Round Robin state parallel to _inputs (blocking mode); a
+        # quantum of 0 grants one message per turn
+        self._quanta: List[int] = []
+        self._deficits: List[int] = []
+        self._active_idx: Optional[int] = None
+        self._drr: bool = False
 
     def add_input(self, port: str) -> None:
         if port not in self.inbox:
             self.add_port(port, direction="in")
             self._inputs.append(port)
+            cell = [None]
+            self._input_deques.append(self.inbox[port])
+            self._inflight_cells.append(cell)
+            self._inputs_ring.append((port, self.inbox[port], cell))
+            self._quanta.append(0)
+            self._deficits.append(0)
+
+    def set_weight(self, port: str, quantum: int) -> None:
+        """Give an input port a DRR quantum in bytes (blocking mode)."""
+        if port not in self._inputs:
+            raise ValueError(f"Unknown arbiter input: {port}")
+        if quantum <= 0:
+            raise ValueError("DRR quantum must be positive")
+        self._quanta[self._inputs.index(port)] = int(quantum)
+        self._drr = True
+
+    @property
+    def _inflight_by_port(self) -> dict:
+        """Per-port inflight markers, built on demand from the cells."""
+        return {p: c[0] for p, c in zip(self._inputs, self._inflight_cells)}
 
     def set_downstream_channel(self, channel: Channel) -> None:
         """Inform the arbiter which channel it feeds for scheduling estimates."""
         self._downstream = channel
 
     def _has_pending(self) -> bool:
-        for p in self._inputs:
-            if self.inbox.get(p) and len(self.inbox[p]) > 0:
-                return True
-        return False
+        return any(self._input_deques)
 
     def _next_nonempty_from(self, start: int) -> Optional[int]:
-        if not self._inputs:
-            return None
-        n = len(self._inputs)
-        for i in range(n):
-            idx = (start + i) % n
-            q = self.inbox.get(self._inputs[idx])
-            if q and len(q) > 0:
+        # Two straight passes (start..n-1, then 0..start-1) instead of modulo stepping
+        deques = self._input_deques
+        start %= len(deques) or 1
+        for idx in range(start, len(deques)):
+            if deques[idx]:
                 return idx
+        for idx in range(start):
+            if deques[idx]:
+                return idx
+        return None
+
+    def _drr_select(self, start: int) -> Optional[int]:
+        # Visit non-empty ports from start, topping up each deficit by its
+        # quantum until one covers its head message; empty ports lose theirs
+        deques = self._input_deques
+        deficits = self._deficits
+        n = len(deques)
+        idx = start % n
+        while True:
+            if not any(deques):
+                return None
+            q = deques[idx]
+            if q:
+                size = q[0].size
+                deficits[idx] += self._quanta[idx] or size
+                if deficits[idx] >= size:
+                    return idx
+            else:
+                deficits[idx] = 0
+            idx = idx + 1 if idx + 1 < n else 0
+
+    def next_wakeup(self, sim) -> Optional[int]:
+        # Sleep while no input is pending; otherwise only transfer completions
+        # change state (freeing ports and the channel's active count)
+        if any(self._input_deques) or self._active_q is not None:
+            # A drained blocking port is released on the following tick
+            return sim.ticks + 1
+        if self._active:
+            return min(a.expected for a in self._active)
+        if self._inflight_marked and self._available_from > sim.ticks:
+            return self._available_from
         return None
 
     def tick(self, sim) -> None:
         if not self._inputs:
             return
 
-        # Clean up completed transfers
         now = sim.ticks
-        if self._downstream is not None and getattr(self._downstream, "transfer_mode", None) == "interleaving":
+        last_tick = self._last_tick
+        self._last_tick = now
+        ch = self._downstream
+        # Decide arbitration + scheduling policy; fall back to the arbiter.mode
+        # legacy mapping when no channel mode is known
+        channel_mode = ch.transfer_mode if ch is not None else None
+        if channel_mode is None:
+            channel_mode = "interleaving" if self.mode == "shared" else "blocking"
+
+        # Clean up completed transfers
+        if ch is not None and ch.transfer_mode == "interleaving":
             # In interleaving, use expected arrival to drop finished
-            self._active = [a for a in self._active if a.get("expected", now + 1) > now]
-            # Update inflight map accordingly
-            active_ports = {a["port"] for a in self._active}
-            for p in self._inputs:
-                if self._inflight_by_port.get(p) and p not in active_ports:
-                    self._inflight_by_port[p] = None
+            # Compact finished transfers out in place (no new list per tick)
+            # and free the finished transfer's port for its next one
+            active = self._active
+            w = 0
+            for a in active:
+                if a.expected > now:
+                    active[w] = a
+                    w += 1
+                else:
+                    a.cell[0] = None
+            if w != len(active):
+                del active[w:]
+                self._expected_max = max((a.expected for a in active), default=0)
         else:
             # In blocking, free channel if time has reached available_from
-            if self._available_from <= now:
+            if self._available_from <= now and self._inflight_marked:
                 # No active inflights remain
-                for p in self._inputs:
-                    self._inflight_by_port[p] = None
-
-        # Decide arbitration + scheduling policy
-        channel_mode = None
-        if self._downstream is not None:
-            channel_mode = self._downstream.transfer_mode
-        # Fallback to arbiter.mode legacy mapping
-        if channel_mode is None:
-            channel_mode = "interleaving" if self.mode == "shared" else "blocking"
+                for cell in self._inflight_cells:
+                    cell[0] = None
+                self._inflight_marked = False
 
+        out = self.out_queue("out")
         if channel_mode == "interleaving":
-            # Round-robin across inputs, forwarding one message at a time
-            start = self._rr_index
-            idx = self._next_nonempty_from(start)
-            visited = 0
-            while idx is not None and visited < len(self._inputs):
-                port = self._inputs[idx]
-                q = self.inbox[port]
+            # Round-robin across inputs, forwarding one message at a time.
+            # One pass over the ring from its head gives each port one chance.
+            # The ring turns once per tick, including ticks spent asleep.
+            skipped = now - last_tick - 1 if last_tick is not None else 0
+            if skipped > 0:
+                self._inputs_ring.rotate(-skipped)
+                self._rr_index = (self._rr_index + skipped) % len(self._inputs)
+            admitted = False
+            active = self._active
+            for port, q, cell in self._inputs_ring:
                 # Allow at most one outstanding per port
-                if q and (not self._inflight_by_port.get(port)):
+                if q and not cell[0]:
                     msg = q.popleft()
                     # Schedule in interleaving set
                     buf_id = None
-                    payload = getattr(msg, "payload", {}) or {}
+                    payload = msg.payload or {}
                     b = payload.get("buffer")
-                    if isinstance(b, dict):
+                    if isinstance(b, DataBuffer):
+                        buf_id = b.id
+                    elif isinstance(b, dict):
                         buf_id = b.get("id")
-                    self._inflight_by_port[port] = buf_id or "inflight"
+                    cell[0] = buf_id or "inflight"
+                    # Without an interleaving channel the blocking-style reset frees the port
+                    self._inflight_marked = True
                     # Add active transfer
-                    self._active.append({
-                        "port": port,
-                        "buf_id": buf_id,
-                        "total": getattr(msg, "size", 1),
-                        "progressed": 0,
-                        "start": now,
-                        "last_update": now,
-                        "per_share_bw": 0,
-                        "expected": now,
-                    })
+                    active.append(_ActiveTransfer(port, cell, buf_id, msg.size, now))
                     # Forward message downstream
-                    self.send("out", msg)
-                    # Recompute expected arrivals for all actives based on shared BW
-                    self._recompute_interleaving(sim)
-                visited += 1
-                next_idx = self._next_nonempty_from(idx + 1)
-                if next_idx is None:
-                    break
-                idx = next_idx
+                    out.append(msg)
+                    admitted = True
+            if admitted:
+                # Recompute expected arrivals for all actives based on shared BW,
+                # once for everything admitted this tick
+                self._recompute_interleaving(sim)
             # Advance RR pointer for next tick
-            self._rr_index = (start + 1) % len(self._inputs)
+            self._inputs_ring.rotate(-1)
+            self._rr_index = (self._rr_index + 1) % len(self._inputs)
             # Update channel active state
-            if self._downstream is not None:
-                active_count = len(self._active)
-                expected_max = max((a.get("expected", 0) for a in self._active), default=sim.ticks)
-                self._downstream.set_active_state(sim.ticks, active_count, expected_max)
+            if ch is not None:
+                active_count = len(active)
+                expected_max = self._expected_max if active_count else now
+                self._publish_active_state(now, active_count, expected_max)
 
         else:  # blocking
             # Keep serving the active port until empty; then pick next non-empty
-            if self._active_port is None or not self.inbox.get(self._active_port) or len(self.inbox[self._active_port]) == 0:
+            q = self._active_q
+            if self._drr:
+                # Give up the turn once the deficit no longer covers the head
+                if q is not None and q and q[0].size > self._deficits[self._active_idx]:
+                    q = None
+                elif q is not None and not q:
+                    self._deficits[self._active_idx] = 0
+            if q is None or not q:
                 # Choose next non-empty port starting from rr_index
-                idx = self._next_nonempty_from(self._rr_index)
-                self._active_port = self._inputs[idx] if idx is not None else None
-                # Advance rr index for fairness next time we switch
-                if idx is not None:
+                if self._drr:
+                    idx = self._drr_select(self._rr_index)
+                else:
+                    idx = self._next_nonempty_from(self._rr_index)
+                if idx is None:
+                    self._active_port = self._active_q = self._active_cell = q = None
+                    self._active_idx = None
+                else:
+                    self._active_idx = idx
+                    self._active_port = self._inputs[idx]
+                    self._active_q = q = self._input_deques[idx]
+                    self._active_cell = self._inflight_cells[idx]
+                    # Advance rr index for fairness next time we switch
                     self._rr_index = (idx + 1) % len(self._inputs)
 
-            if self._active_port is None:
+            if q is None:
                 return
 
-            q = self.inbox[self._active_port]
             # Drain as many messages as available into outbox this tick
             # In blocking mode, only admit a message if channel is free
-            if self._available_from <= now and q:
+            available_from = self._available_from
+            if available_from <= now and q:
                 msg = q.popleft()
-                if isinstance(msg, Message) and getattr(msg, "kind", None) == "buffer_transfer" and self._downstream is not None:
-                    size = getattr(msg, "size", 1)
-                    start_time = max(now, self._available_from)
-                    duration = self._downstream.estimate_ticks(size)
+                if self._drr:
+                    self._deficits[self._active_idx] -= msg.size
+                if isinstance(msg, Message) and msg.kind == "buffer_transfer" and ch is not None:
+                    size = msg.size
+                    start_time = max(now, available_from)
+                    duration = ch.estimate_ticks(size)
                     arrival = start_time + duration
-                    payload = getattr(msg, "payload", {}) or {}
+                    payload = msg.payload or {}
                     buf_dict = payload.get("buffer")
                     buf_id = None
-                    if isinstance(buf_dict, dict):
+                    if isinstance(buf_dict, DataBuffer):
+                        buf_id = buf_dict.id
+                    elif isinstance(buf_dict, dict):
                         buf_id = buf_dict.get("id")
                     if buf_id:
-                        sim.buffer_pool.record_expected_arrival(str(buf_id), arrival)
-                    self._available_from = arrival
+                        sim.buffer_pool.record_expected_arrival(buf_id, arrival)
+                    self._available_from = available_from = arrival
                     # Mark inflight for the active port
-                    self._inflight_by_port[self._active_port] = buf_id or "inflight"
-                self.send("out", msg)
+                    self._active_cell[0] = buf_id or "inflight"
+                    self._inflight_marked = True
+                out.append(msg)
             # Update channel active state: busy if available_from in future
-            if self._downstream is not None:
-                active_count = 1 if self._available_from > now else 0
-                self._downstream.set_active_state(now, active_count, self._available_from if active_count else None)
+            if ch is not None:
+                active_count = 1 if available_from > now else 0
+                self._publish_active_state(now, active_count, available_from if active_count else None)
+
+    def _publish_active_state(self, now: int, active_count: int, expected_end: Optional[int]) -> None:
+        # Only forward changes; the channel keeps the last state it was given
+        state = (active_count, expected_end)
+        if state != self._published:
+            self._published = state
+            self._downstream.set_active_state(now, active_count, expected_end)
 
     def _recompute_interleaving(self, sim) -> None:
         if not self._downstream or not self._active:
@@ -190,20 +340,30 @@ class Arbiter(Resource):
         n = max(1, len(self._active))
         current_bw = self._downstream.current_bandwidth
         share_bw = max(0, int(current_bw / n))
+        latency = int(self._downstream.latency)
+        arrivals = []
+        expected_max = 0
         for a in self._active:
             # Accumulate progress since last update using previous share
-            dt = max(0, now - int(a.get("last_update", now)))
-            prev_bw = int(a.get("per_share_bw", share_bw)) or share_bw
-            a["progressed"] = min(a["total"], int(a.get("progressed", 0)) + dt * prev_bw)
-            remaining = max(0, a["total"] - a["progressed"])
+            dt = now - a.last_update
+            if dt > 0:
+                progressed = a.progressed + dt * (a.per_share_bw or share_bw)
+                a.progressed = progressed if progressed < a.total else a.total
+            remaining = a.total - a.progressed
             # Remaining latency budget from start
-            lat_elapsed = max(0, now - int(a.get("start", now)))
-            lat_rem = max(0, int(self._downstream.latency) - lat_elapsed)
+            lat_elapsed = now - a.start
+            lat_rem = latency - lat_elapsed if lat_elapsed > 0 else latency
+            if lat_rem < 0:
+                lat_rem = 0
             data_ticks = (remaining + share_bw - 1) // share_bw if share_bw > 0 else 10**9
             expected = now + lat_rem + data_ticks
-            a["per_share_bw"] = share_bw
-            a["last_update"] = now
-            a["expected"] = expected
-            buf_id = a.get("buf_id")
-            if buf_id:
-                sim.buffer_pool.record_expected_arrival(str(buf_id), expected)
+            a.per_share_bw = share_bw
+            a.last_update = now
+            a.expected = expected
+            if expected > expected_max:
+                expected_max = expected
+            if a.buf_id:
+                arrivals.append((a.buf_id, expected))
+        self._expected_max = expected_max
+        if arrivals:
+            sim.buffer_pool.record_expected_arrivals(arrivals)
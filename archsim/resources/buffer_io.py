@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from ..core.resource import Resource
 from ..core.message import Message
 from ..core.databuffer import DataBuffer
@@ -18,6 +20,9 @@ class BufferProducer(Resource):
         self.issue_tick = max(0, issue_tick)
         self._sent = False
 
+    def next_wakeup(self, sim) -> Optional[int]:
+        return None if self._sent else self.issue_tick
+
     def tick(self, sim) -> None:
         if not self._sent and sim.ticks >= self.issue_tick:
             # Ensure buffer is registered (owned by the producer initially)
@@ -29,7 +34,7 @@ class BufferProducer(Resource):
                 dst=self.target_memory,
                 size=self.buffer.size,
                 kind="buffer_transfer",
-                payload={"buffer": self.buffer.to_dict()},
+                payload={"buffer": self.buffer},
                 created_at=sim.ticks,
             )
             self.send("out", msg)
@@ -43,7 +48,7 @@ class BufferConsumer(Resource):
     freeing the buffer by id.
     """
 
-    def __init__(self, name: str, buffer_id: str, target_memory: str = "memory", consume_tick: int = 10):
+    def __init__(self, name: str, buffer_id: int, target_memory: str = "memory", consume_tick: int = 10):
         super().__init__(name)
         self.add_port("out", direction="out")
         self.add_port("in", direction="in")
@@ -52,11 +57,15 @@ class BufferConsumer(Resource):
         self.consume_tick = max(0, consume_tick)
         self._issued = False
 
+    def next_wakeup(self, sim) -> Optional[int]:
+        return None if self._issued else self.consume_tick
+
     def tick(self, sim) -> None:
         # Drain any incoming messages (e.g., acks), but logic is minimal here
         inq = self.inbox["in"]
-        while inq:
-            _ = inq.popleft()
+        if inq:
+            sim.message_pool.release_many(inq)
+            inq.clear()
 
         if not self._issued and sim.ticks >= self.consume_tick:
             msg = Message(
@@ -12,43 +12,57 @@ class Bus(Resource):
         self.bandwidth = bandwidth  # bytes per tick from aggregated senders
         self.add_port("out", direction="out")
         self._rr_order: List[str] = []  # round-robin over input ports
+        # Input deques in round-robin order; the head is served next
+        self._rr: Deque[Deque] = deque()
 
     def add_input(self, port: str) -> None:
         if port not in self.inbox:
             self.add_port(port, direction="in")
             self._rr_order.append(port)
+            self._rr.append(self.inbox[port])
 
-    def tick(self, sim) -> None:
-        # Ensure rr order up to date for dynamic ports
-        for p in self.inbox.keys():
+    def _sync_ports(self) -> None:
+        # Pick up ports added directly via add_port/in_queue
+        for p, q in self.inbox.items():
             if p not in self._rr_order:
                 self._rr_order.append(p)
+                self._rr.append(q)
 
-        remaining = self.bandwidth
-        if not self._rr_order:
+    def next_wakeup(self, sim) -> Optional[int]:
+        # Purely input-driven
+        return sim.ticks + 1 if any(self.inbox.values()) else None
+
+    def tick(self, sim) -> None:
+        # Ensure rr order up to date for dynamic ports (inbox only grows)
+        if len(self.inbox) != len(self._rr_order):
+            self._sync_ports()
+
+        ring = self._rr
+        # Idle: a full fruitless pass would leave the ring where it started
+        if not any(ring):
             return
 
-        # Round-robin arbitration across inputs, moving whole messages if they fit
-        start_idx = getattr(self, "_last_idx", 0) % max(1, len(self._rr_order))
-        idx = start_idx
+        # Round-robin arbitration across inputs, moving whole messages if they
+        # fit; the ring rotates as ports are visited so the next tick resumes
+        # after the last port served
+        n = len(ring)
+        out = self.out_queue("out")
+        remaining = self.bandwidth
+        steps = 0
         spins = 0
         moved_any = False
-        while remaining > 0 and spins <= len(self._rr_order):
-            port = self._rr_order[idx % len(self._rr_order)]
-            q = self.inbox.get(port)
-            if q and q:
-                msg = q[0]
-                size = getattr(msg, "size", 1)
+        while remaining > 0 and spins <= n:
+            q = ring[0]
+            if q:
+                size = q[0].size
                 if size <= remaining:
-                    q.popleft()
-                    self.send("out", msg)
+                    out.append(q.popleft())
                     remaining -= size
                     moved_any = True
-            idx += 1
-            if idx - start_idx >= len(self._rr_order):
+            ring.rotate(-1)
+            steps += 1
+            if steps >= n:
                 spins += 1
                 if not moved_any:
                     break
                 moved_any = False
-        self._last_idx = idx
-
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional, List, Tuple
+import heapq
+import itertools
+from typing import List, Optional, Tuple
 
 from ..core.resource import Resource
 from ..core.message import Message
@@ -9,6 +11,22 @@ from .pe import ProcessingElement
 
 
 class ComputeUnit(ProcessingElement):
+    __slots__ = (
+        "total_requests",
+        "request_size",
+        "issue_interval",
+        "request_kind",
+        "_issued",
+        "_received",
+        "_last_issue_tick",
+        "produce_buffers",
+        "buffer_size",
+        "buffer_dest",
+        "consume_after",
+        "_consume_queue",
+        "_consume_seq",
+    )
+
     def __init__(
         self,
         name: str,
@@ -38,42 +56,56 @@ class ComputeUnit(ProcessingElement):
         self.buffer_size = buffer_size
         self.buffer_dest = buffer_dest
         self.consume_after = consume_after
-        self._consume_queue: List[Tuple[int, str]] = []  # (due_tick, buffer_id)
+        # Min-heap of (due_tick, seq, buffer_id); seq keeps equal due ticks FIFO
+        self._consume_queue: List[Tuple[int, int, int]] = []
+        self._consume_seq = itertools.count()
+
+    def next_wakeup(self, sim) -> Optional[int]:
+        # Responses arrive via delivery; otherwise wake for the next issue or consume
+        wake = None
+        if self._issued < self.total_requests:
+            wake = self._last_issue_tick + self.issue_interval
+        if self._consume_queue and (wake is None or self._consume_queue[0][0] < wake):
+            wake = self._consume_queue[0][0]
+        return wake
 
     def tick(self, sim) -> None:
         # Receive any responses
         inq = self.inbox["in0"]
-        while inq:
-            msg = inq.popleft()
-            if msg.kind == "resp":
-                self._received += 1
+        if inq:
+            received = 0
+            for msg in inq:
+                if msg.kind == "resp":
+                    received += 1
+            self._received += received
+            sim.message_pool.release_many(inq)
+            inq.clear()
 
         # Optionally issue buffer creations/transfers
         if self.produce_buffers:
             if self._issued < self.total_requests and (sim.ticks - self._last_issue_tick) >= self.issue_interval:
                 buf = DataBuffer(size=self.buffer_size)
                 # Register ownership with the pool (owned by compute until transferred)
-                sim.buffer_pool.register(buf, owner=self.name)
-                sim.buffer_pool.set_state(sim, buf.id, "allocated")
+                sim.buffer_pool.register_in_transit(sim, buf, owner=self.name)
                 msg = Message(
                     src=self.name,
                     dst=self.buffer_dest,
                     size=buf.size,
                     kind="buffer_transfer",
-                    payload={"buffer": buf.to_dict()},
+                    payload={"buffer": buf},
                     created_at=sim.ticks,
                 )
                 self.send("out0", msg)
-                sim.buffer_pool.set_state(sim, buf.id, "transit")
                 self._issued += 1
                 self._last_issue_tick = sim.ticks
                 if self.consume_after is not None:
-                    self._consume_queue.append((sim.ticks + max(0, self.consume_after), buf.id))
+                    due = sim.ticks + max(0, self.consume_after)
+                    heapq.heappush(self._consume_queue, (due, next(self._consume_seq), buf.id))
         else:
             # Issue new request if allowed by interval and quota
             if self._issued < self.total_requests:
                 if (sim.ticks - self._last_issue_tick) >= self.issue_interval:
-                    req = Message(
+                    req = sim.message_pool.acquire(
                         src=self.name,
                         dst="memory",  # symbolic; route decided by topology
                         size=self.request_size,
@@ -88,7 +120,7 @@ class ComputeUnit(ProcessingElement):
         if self._consume_queue:
             # Maintain FIFO by due tick
             while self._consume_queue and self._consume_queue[0][0] <= sim.ticks:
-                _, bid = self._consume_queue.pop(0)
+                _, _, bid = heapq.heappop(self._consume_queue)
                 msg = Message(
                     src=self.name,
                     dst=self.buffer_dest,
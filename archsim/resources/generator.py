@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 from typing import Optional, List, Dict, Any
 
 from ..core.resource import Resource
@@ -19,6 +21,20 @@ class BufferGenerator(Resource):
     - total: total number of buffers to generate (None = infinite)
     """
 
+    __slots__ = (
+        "period",
+        "buffer_size",
+        "target_memory",
+        "start_tick",
+        "total",
+        "_next_tick",
+        "_produced",
+        "triggers",
+        "auto_consume_after",
+        "_consume_queue",
+        "_consume_seq",
+    )
+
     def __init__(
         self,
         name: str,
@@ -42,17 +58,30 @@ class BufferGenerator(Resource):
         self._produced = 0
         self.triggers = list(triggers) if triggers else []
         self.auto_consume_after = auto_consume_after
-        self._consume_queue: List[tuple[int, str]] = []  # (due_tick, buffer_id)
+        # Min-heap of (due_tick, seq, buffer_id); seq keeps equal due ticks FIFO
+        self._consume_queue: List[tuple[int, int, int]] = []
+        self._consume_seq = itertools.count()
+
+    def next_wakeup(self, sim) -> Optional[int]:
+        # Acks arrive via delivery; otherwise wake for the next buffer or consume
+        if self.total is not None and self._produced >= self.total:
+            return None
+        wake = self._next_tick
+        if self._consume_queue and self._consume_queue[0][0] < wake:
+            wake = self._consume_queue[0][0]
+        return wake
 
     def tick(self, sim) -> None:
         # Drain any incoming responses/acks and capture buffer_ids
         inq = self.inbox["in"]
         while inq:
             msg = inq.popleft()
-            if self.auto_consume_after is not None and getattr(msg, "kind", None) == "buffer_ack":
-                buf_id = (getattr(msg, "payload", {}) or {}).get("buffer_id")
+            if self.auto_consume_after is not None and msg.kind == "buffer_ack":
+                buf_id = (msg.payload or {}).get("buffer_id")
                 if buf_id:
-                    self._consume_queue.append((sim.ticks + max(0, self.auto_consume_after), str(buf_id)))
+                    due = sim.ticks + max(0, self.auto_consume_after)
+                    heapq.heappush(self._consume_queue, (due, next(self._consume_seq), buf_id))
+            sim.message_pool.release(msg)
 
         if self.total is not None and self._produced >= self.total:
             return
@@ -61,26 +90,25 @@ class BufferGenerator(Resource):
             # Create and register buffer owned by generator
             buf = DataBuffer(size=self.buffer_size)
             if self.triggers:
-                buf.triggers = list(self.triggers)
-            sim.buffer_pool.register(buf, owner=self.name)
-            sim.buffer_pool.set_state(sim, buf.id, "allocated")
+                # Shared list; the pool parses it once and reuses that while it is unchanged
+                buf.triggers = self.triggers
+            sim.buffer_pool.register_in_transit(sim, buf, owner=self.name)
             # Send transfer request to memory
             msg = Message(
                 src=self.name,
                 dst=self.target_memory,
                 size=buf.size,
                 kind="buffer_transfer",
-                payload={"buffer": buf.to_dict()},
+                payload={"buffer": buf},
                 created_at=sim.ticks,
             )
             self.send("out", msg)
-            sim.buffer_pool.set_state(sim, buf.id, "transit")
             self._produced += 1
             self._next_tick += self.period
 
         # Emit scheduled buffer_consume requests
         while self._consume_queue and self._consume_queue[0][0] <= sim.ticks:
-            _, bid = self._consume_queue.pop(0)
+            _, _, bid = heapq.heappop(self._consume_queue)
             msg = Message(
                 src=self.name,
                 dst=self.target_memory,
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, List, Tuple, Dict, Optional
+import bisect
+import heapq
+import itertools
+import sys
+from typing import List, Tuple, Dict, Optional
 
 from ..core.resource import Resource
 from ..core.message import Message
@@ -10,6 +13,30 @@ from ..core.queues import InputQueue, OutputQueue
 
 
 class Memory(Resource):
+    __slots__ = (
+        "latency",
+        "max_issue_per_tick",
+        "size_limit",
+        "fill_rate",
+        "drain_rate",
+        "_inflight",
+        "_inflight_seq",
+        "_max_ready",
+        "_inflight_sorted",
+        "_last_sim",
+        "bytes_current",
+        "_bytes_in_tick",
+        "_bytes_out_tick",
+        "backpressured",
+        "_inbound_channels",
+        "_bp_published",
+        "_queues_registered",
+        "_iq",
+        "_oq",
+        "_inq",
+        "_outq",
+    )
+
     def __init__(self, name: str, latency: int = 20, max_issue_per_tick: int = 1, size_limit: int = 1_000_000, fill_rate: int = 1_000_000, drain_rate: int = 1_000_000):
         super().__init__(name)
         self.latency = latency
@@ -19,7 +46,13 @@ class Memory(Resource):
         self.drain_rate = drain_rate
         self.add_port("in", direction="in")
         self.add_port("out", direction="out")
-        self._inflight: Deque[Tuple[int, Message]] = deque()
+        # Min-heap of (ready_tick, seq, Message); seq keeps equal ticks FIFO
+        self._inflight: List[Tuple[int, int, Message]] = []
+        self._inflight_seq = itertools.count()
+        # Largest ready tick queued so far; later ticks can append in bulk
+        self._max_ready: int = 0
+        # True while every insert was a bulk append, i.e. the heap list is fully sorted
+        self._inflight_sorted: bool = True
         # Keep last simulator reference for reporting
         self._last_sim = None
         self.bytes_current: int = 0
@@ -27,19 +60,24 @@ class Memory(Resource):
         self._bytes_out_tick: int = 0
         self.backpressured: bool = False
         self._inbound_channels: list = []
+        # Backpressure state last pushed to inbound channels (None: push next tick)
+        self._bp_published: Optional[bool] = None
         self._queues_registered = False
         # Queue wrappers
         self._iq = InputQueue(parent=self.name, direction="in", function="in")
         self._iq.items = self.inbox["in"]
         self._oq = OutputQueue(parent=self.name, function="out")
         self._oq.items = self.outbox["out"]
+        # Port deques are fixed for the resource's lifetime; skip the dict lookups
+        self._inq = self.inbox["in"]
+        self._outq = self.outbox["out"]
 
     # Buffer APIs
     def allocate_buffer(self, sim, buf: DataBuffer) -> None:
         buf.owner_memory = self.name
         sim.buffer_pool.register(buf, owner=self.name)
 
-    def deallocate_buffer(self, sim, buf_id: str) -> Optional[DataBuffer]:
+    def deallocate_buffer(self, sim, buf_id: int) -> Optional[DataBuffer]:
         owner = sim.buffer_pool.owner(buf_id)
         if owner == self.name:
             return sim.buffer_pool.delete(buf_id)
@@ -53,9 +91,20 @@ class Memory(Resource):
             return 0
         return sim.buffer_pool.bytes_owned(self.name)
 
+    def next_wakeup(self, sim) -> Optional[int]:
+        # Idle until the next response is due unless requests or byte counts remain
+        if self._inq or self._bytes_in_tick or self._bytes_out_tick:
+            return sim.ticks + 1
+        if self._inflight:
+            return self._inflight[0][0]
+        return None
+
     def register_inbound_channel(self, channel) -> None:
+        if not callable(getattr(channel, "set_backpressure", None)):
+            raise TypeError("Memory inbound channel must implement set_backpressure(flag)")
         if channel not in self._inbound_channels:
             self._inbound_channels.append(channel)
+            self._bp_published = None
 
     def tick(self, sim) -> None:
         # Track last sim for reporting
@@ -67,17 +116,32 @@ class Memory(Resource):
         self._bytes_in_tick = 0
         self._bytes_out_tick = 0
 
-        # Issue new requests up to throughput
-        issued = 0
-        inq = self.inbox["in"]
-        while inq and issued < self.max_issue_per_tick:
-            req = inq.popleft()
-            kind = getattr(req, "kind", "data")
-            self._bytes_in_tick += getattr(req, "size", 0)
+        # Issue new requests up to throughput; every response issued this tick
+        # shares one ready tick
+        now = sim.ticks
+        name = self.name
+        ready_tick = now + max(0, self.latency)
+        acquire = sim.message_pool.acquire
+        release = sim.message_pool.release
+        seq = self._inflight_seq
+        # Take this tick's requests in one go, then build responses in order
+        inq = self._inq
+        k = self.max_issue_per_tick
+        if len(inq) <= k:
+            batch = list(inq)
+            inq.clear()
+        else:
+            popleft = inq.popleft
+            batch = [popleft() for _ in range(k)]
+        staged = []
+        push = staged.append
+        for req in batch:
+            kind = req.kind
+            self._bytes_in_tick += req.size
 
             # Handle DataBuffer lifecycle operations
             if kind == "buffer_transfer":
-                payload = getattr(req, "payload", {}) or {}
+                payload = req.payload or {}
                 buf_dict = payload.get("buffer")
                 if isinstance(buf_dict, DataBuffer):
                     buf = buf_dict
@@ -85,76 +149,81 @@ class Memory(Resource):
                     buf = DataBuffer.from_dict(buf_dict)
                 else:
                     # If no explicit buffer provided, synthesize from message size
-                    buf = DataBuffer(size=getattr(req, "size", 1))
+                    buf = DataBuffer(size=req.size)
                 # Register / transfer ownership to this memory
                 if sim.buffer_pool.exists(buf.id):
-                    sim.buffer_pool.transfer(buf.id, self.name)
+                    sim.buffer_pool.transfer(buf.id, name)
                 else:
                     self.allocate_buffer(sim, buf)
                 # Optional ACK
-                ack = Message(
-                    src=self.name,
-                    dst=req.src,
-                    size=1,
-                    kind="buffer_ack",
-                    payload={"buffer_id": buf.id},
-                    created_at=sim.ticks,
-                )
-                ready_tick = sim.ticks + max(0, self.latency)
-                self._inflight.append((ready_tick, ack))
+                ack = acquire(name, req.src, 1, "buffer_ack", {"buffer_id": buf.id}, now)
+                push((ready_tick, next(seq), ack))
                 # Mark responded at enqueue time (delivery will occur later)
                 sim.buffer_pool.set_state(sim, buf.id, "responded")
-                issued += 1
+                release(req)
                 continue
 
             if kind == "buffer_consume":
-                payload = getattr(req, "payload", {}) or {}
+                payload = req.payload or {}
                 buf_id = payload.get("buffer_id")
                 if buf_id:
-                    self.deallocate_buffer(sim, str(buf_id))
-                    sim.buffer_pool.set_state(sim, str(buf_id), "deallocated")
+                    self.deallocate_buffer(sim, buf_id)
+                    sim.buffer_pool.set_state(sim, buf_id, "deallocated")
                 # Optional ACK to requester
-                ack = Message(
-                    src=self.name,
-                    dst=req.src,
-                    size=1,
-                    kind="buffer_freed",
-                    payload={"buffer_id": buf_id},
-                    created_at=sim.ticks,
-                )
-                ready_tick = sim.ticks + max(0, self.latency)
-                self._inflight.append((ready_tick, ack))
-                issued += 1
+                ack = acquire(name, req.src, 1, "buffer_freed", {"buffer_id": buf_id}, now)
+                push((ready_tick, next(seq), ack))
+                release(req)
                 continue
 
-            # Default behavior: memory request/response
-            resp = Message(
-                src=self.name,
-                dst=req.src,  # return to sender
-                size=req.size,
-                kind="resp",
-                payload={"reply_to": req.id, "kind": req.kind},
-                created_at=sim.ticks,
-            )
-            ready_tick = sim.ticks + max(0, self.latency)
-            self._inflight.append((ready_tick, resp))
-            issued += 1
+            # Default behavior: memory request/response (returned to sender)
+            resp = acquire(name, req.src, req.size, "resp", {"reply_to": req.id, "kind": kind}, now)
+            push((ready_tick, next(seq), resp))
+            release(req)
+
+        inflight = self._inflight
+        if staged:
+            if ready_tick >= self._max_ready:
+                # Keys are >= everything queued, so appending keeps the heap valid
+                inflight.extend(staged)
+                self._max_ready = ready_tick
+            else:
+                for entry in staged:
+                    heapq.heappush(inflight, entry)
+                self._inflight_sorted = False
 
         # Emit ready responses
-        while self._inflight and self._inflight[0][0] <= sim.ticks:
-            _, resp = self._inflight.popleft()
-            self._bytes_out_tick += getattr(resp, "size", 0)
-            self.send("out", resp)
-
-        # Update occupancy with fill/drain rates
-        fill = min(self._bytes_in_tick, self.fill_rate)
-        self.bytes_current = min(self.size_limit, self.bytes_current + fill)
-        drain = min(self._bytes_out_tick, self.drain_rate, self.bytes_current)
-        self.bytes_current = max(0, self.bytes_current - drain)
-        # Determine backpressure and propagate to inbound channels
-        self.backpressured = self.bytes_current >= self.size_limit
-        for ch in self._inbound_channels:
-            try:
-                ch.set_backpressure(self.backpressured)
-            except Exception:
-                pass
+        if inflight and inflight[0][0] <= now:
+            if self._inflight_sorted:
+                # Sorted list: slice off the ready prefix in one step
+                k = bisect.bisect_right(inflight, (now, sys.maxsize))
+                ready = [entry[2] for entry in inflight[:k]]
+                del inflight[:k]
+                self._bytes_out_tick += sum(resp.size for resp in ready)
+                self._outq.extend(ready)
+            else:
+                outq = self._outq
+                while inflight and inflight[0][0] <= now:
+                    _, _, resp = heapq.heappop(inflight)
+                    self._bytes_out_tick += resp.size
+                    outq.append(resp)
+            if not inflight:
+                self._inflight_sorted = True
+
+        # Update occupancy with fill/drain rates (no-op when no bytes moved)
+        bytes_in = self._bytes_in_tick
+        bytes_out = self._bytes_out_tick
+        if bytes_in or bytes_out:
+            fill = bytes_in if bytes_in < self.fill_rate else self.fill_rate
+            current = self.bytes_current + fill
+            if current > self.size_limit:
+                current = self.size_limit
+            drain = min(bytes_out, self.drain_rate, current)
+            current -= drain
+            self.bytes_current = current if current > 0 else 0
+        # Determine backpressure; inbound channels only hear about transitions
+        backpressured = self.bytes_current >= self.size_limit
+        self.backpressured = backpressured
+        if backpressured is not self._bp_published:
+            self._bp_published = backpressured
+            for ch in self._inbound_channels:
+                ch.set_backpressure(backpressured)
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import math
 import random
 from typing import Callable, List, Optional, Tuple, Dict, Any, Union
 
 from ..core.resource import Resource
 from ..core.message import Message
-from ..core.databuffer import DataBuffer
+from ..core.databuffer import DataBuffer, BufferRoles
 from ..core.queues import InputQueue, OutputQueue
 
 
@@ -26,6 +25,34 @@ class ProcessingElement(Resource):
     Busy/idle accounting is tracked for profiling.
     """
 
+    __slots__ = (
+        "_mode",
+        "_tick_planned",
+        "in_names",
+        "out_names",
+        "in_out_ratio",
+        "output_target",
+        "process_fn",
+        "backpressure_prob",
+        "_random",
+        "_busy_this_tick",
+        "_ticks",
+        "_busy_ticks",
+        "state",
+        "_current_cmd",
+        "_current_inputs",
+        "_remaining",
+        "_input_cursor",
+        "_consume_rate",
+        "_output_progress",
+        "_expected_output_size",
+        "_input_queues",
+        "_output_queues",
+        "_queues_registered",
+        "_in_qs",
+        "_cmdq",
+    )
+
     def __init__(
         self,
         name: str,
@@ -36,12 +63,12 @@ class ProcessingElement(Resource):
         output_target: Optional[str] = None,
         process_fn: Optional[Callable[["ProcessingElement", Any, List[Message]], List[Message]]] = None,
         backpressure_prob: float = 0.2,
+        seed: Optional[int] = None,
     ) -> None:
         super().__init__(name)
         if in_queues <= 0 or out_queues <= 0:
             raise ValueError("PE requires at least one input and one output queue")
-        if mode not in ("dummy", "pro"):
-            raise ValueError("PE mode must be 'dummy' or 'pro'")
+        self._tick_planned = False
         self.mode = mode
         self.in_names = [f"in{i}" for i in range(in_queues)]
         self.out_names = [f"out{i}" for i in range(out_queues)]
@@ -55,6 +82,10 @@ class ProcessingElement(Resource):
         self.output_target = output_target  # e.g., memory name
         self.process_fn = process_fn
         self.backpressure_prob = max(0.0, min(1.0, backpressure_prob))
+        # Private stream so skipped draws (p of 0 or 1) never shift another
+        # PE's or user code's random sequence; unseeded PEs derive their seed
+        # from the global `random`, so random.seed() still reproduces a run
+        self._random = random.Random(seed if seed is not None else random.getrandbits(64)).random
 
         # Busy/idle accounting
         self._busy_this_tick = False
@@ -63,7 +94,9 @@ class ProcessingElement(Resource):
         # State machine for pro mode
         self.state = "idle"
         self._current_cmd: Optional[Message] = None
-        self._current_inputs: List[Dict[str, Any]] = []  # [{buf, remaining}]
+        self._current_inputs: List[Any] = []  # input buffers of the current command
+        self._remaining: List[int] = []  # bytes left per input, parallel to _current_inputs
+        self._input_cursor: int = 0  # first input with bytes left (inputs drain in order)
         self._consume_rate: int = 0
         self._output_progress: int = 0
         self._expected_output_size: int = 0
@@ -78,19 +111,21 @@ class ProcessingElement(Resource):
             oq = OutputQueue(parent=self.name, function=n)
             oq.items = self.outbox[n]
             self._output_queues.append(oq)
+        # Port deques are fixed for the resource's lifetime; skip the dict lookups
+        self._in_qs = [self.inbox[n] for n in self.in_names]
+        self._cmdq = self.inbox["cmd"]
         self._queues_registered = False
 
     def _pop_command(self):
-        q = self.inbox["cmd"]
+        q = self._cmdq
         if q:
             return q.popleft()
         return None
 
     def _gather_inputs(self) -> List[Message]:
         gathered: List[Message] = []
-        for n in self.in_names:
-            q = self.inbox.get(n)
-            if q and q:
+        for q in self._in_qs:
+            if q:
                 gathered.append(q.popleft())
         return gathered
 
@@ -105,26 +140,30 @@ class ProcessingElement(Resource):
             return
         # Determine total input size by treating messages with buffers specially
         total = 0
-        bufs: List[DataBuffer] = []
         for m in inputs:
-            if isinstance(m, Message):
-                payload = getattr(m, "payload", {}) or {}
-                b = payload.get("buffer")
-                if isinstance(b, dict):
-                    try:
-                        size = int(b.get("size", m.size))
-                    except Exception:
-                        size = m.size
-                    total += size
-                else:
-                    total += getattr(m, "size", 1)
-        # Compute output size based on ratio
+            if not isinstance(m, Message):
+                continue
+            payload = m.payload
+            b = payload.get("buffer") if payload else None
+            if b is None:
+                total += m.size
+            elif isinstance(b, DataBuffer):
+                total += b.size
+            elif isinstance(b, dict):
+                try:
+                    size = int(b.get("size", m.size))
+                except Exception:
+                    size = m.size
+                total += size
+            else:
+                total += m.size
+        # Compute output size based on ratio (exact integer floor)
         in_n, out_n = self.in_out_ratio
-        out_size = max(1, math.floor(total * (out_n / max(1, in_n))))
+        out_size = max(1, total * out_n // max(1, in_n))
         # Create a new buffer and register
-        buf = DataBuffer(size=out_size)
-        sim.buffer_pool.register(buf, owner=self.name)
-        sim.buffer_pool.set_state(sim, buf.id, "allocated")
+        # Pool-made, so the buffer is recycled once deleted (BufferPool.recycle_limit)
+        buf = sim.buffer_pool.create(out_size, owner=self.name)
+        sim.buffer_pool.set_state(sim, buf.id, "transit")
         # Emit a transfer if target is provided; otherwise, emit a local message
         dst = self.output_target or "memory"
         msg = Message(
@@ -132,119 +171,165 @@ class ProcessingElement(Resource):
             dst=dst,
             size=buf.size,
             kind="buffer_transfer",
-            payload={"buffer": buf.to_dict()},
+            payload={"buffer": buf},
             created_at=sim.ticks,
         )
         self._emit_outputs(sim, [msg])
-        sim.buffer_pool.set_state(sim, buf.id, "transit")
         self._busy_this_tick = True
 
     def _start_command_if_ready(self) -> None:
         # Need a command and at least one item in each input queue
-        cmdq = self.inbox["cmd"]
+        cmdq = self._cmdq
         if not cmdq:
             return
-        for n in self.in_names:
-            q = self.inbox.get(n)
-            if not q or len(q) == 0:
-                return
+        in_qs = self._in_qs
+        if not all(in_qs):
+            return
         # Pop command and one buffer from each input
         self._current_cmd = cmdq.popleft()
         self._current_inputs = []
+        self._remaining = []
+        self._input_cursor = 0
         total_in = 0
-        for n in self.in_names:
-            buf = self.inbox[n].popleft()
+        for q in in_qs:
+            buf = q.popleft()
             if isinstance(buf, DataBuffer):
                 remaining = buf.size
             elif isinstance(buf, Message):
                 remaining = getattr(buf, "size", 0)
             else:
                 remaining = getattr(buf, "size", 0)
-            self._current_inputs.append({"buf": buf, "remaining": remaining})
+            self._current_inputs.append(buf)
+            self._remaining.append(remaining)
             total_in += remaining
         # Rate from command payload or default
         rate =  max(1, int((getattr(self._current_cmd, "payload", {}) or {}).get("rate", 64)))
         self._consume_rate = rate
         in_n, out_n = self.in_out_ratio
-        self._expected_output_size = max(1, math.floor(total_in * (out_n / max(1, in_n))))
+        self._expected_output_size = max(1, total_in * out_n // max(1, in_n))
         self._output_progress = 0
         self.state = "busy"
 
     def _simulate_backpressure(self) -> bool:
-        # Randomly signal backpressure
-        if random.random() < self.backpressure_prob:
+        # Randomly signal backpressure; 0 and 1 need no draw
+        p = self.backpressure_prob
+        if p <= 0.0:
+            return False
+        if p >= 1.0:
             return True
-        return False
+        return self._random() < p
 
     def _relieve_backpressure(self) -> bool:
         # Randomly relieve backpressure
-        return random.random() < 0.5
+        return self._random() < 0.5
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: str) -> None:
+        if mode not in ("dummy", "pro"):
+            raise ValueError("PE mode must be 'dummy' or 'pro'")
+        # The topology's tick plan holds the variant for the current mode
+        if self._tick_planned and mode != self._mode:
+            raise ValueError("PE mode cannot change after the PE is added to a Topology")
+        self._mode = mode
 
     def tick(self, sim) -> None:
-        if not self._queues_registered and hasattr(sim, "topology"):
+        if self._mode == "dummy":
+            self._tick_dummy(sim)
+        else:
+            self._tick_pro(sim)
+
+    def _tick_callable(self):
+        # Mode is fixed for the PE's lifetime, so the simulator can call the
+        # matching variant directly; subclasses overriding tick() keep theirs
+        self._tick_planned = True
+        if type(self).tick is not ProcessingElement.tick:
+            return self.tick
+        return self._tick_dummy if self._mode == "dummy" else self._tick_pro
+
+    def _register_queues(self, sim) -> None:
+        if hasattr(sim, "topology"):
             for q in self._input_queues + self._output_queues:
                 sim.topology.register_queue(q)
             self._queues_registered = True
+
+    def _tick_dummy(self, sim) -> None:
+        if not self._queues_registered:
+            self._register_queues(sim)
         self._busy_this_tick = False
-        if self.mode == "dummy":
-            self._dummy_process(sim)
-        else:
-            # Pro mode: simple state machine with random backpressure
-            if self.state == "idle":
-                self._start_command_if_ready()
-            if self.state == "backpressured":
-                if self._relieve_backpressure():
-                    self.state = "busy"
-                else:
-                    return
-            if self.state == "busy":
-                if self._simulate_backpressure():
-                    self.state = "backpressured"
-                    return
-                if not self._current_inputs:
-                    self.state = "idle"
-                    return
-                remaining_budget = self._consume_rate
-                consumed_total = 0
-                for slot in self._current_inputs:
-                    if remaining_budget <= 0:
-                        break
-                    rem = slot.get("remaining", 0)
-                    if rem <= 0:
-                        continue
-                    take = min(rem, remaining_budget)
-                    slot["remaining"] = rem - take
-                    remaining_budget -= take
-                    consumed_total += take
-                self._output_progress += consumed_total
-                self._busy_this_tick = consumed_total > 0
-                # Check if all inputs consumed
-                if all(slot.get("remaining", 0) <= 0 for slot in self._current_inputs):
-                    # Build output buffer
-                    out_size = max(1, self._expected_output_size)
-                    buf = DataBuffer(size=out_size, owner_memory=self.name, role="destination")
-                    sim.buffer_pool.register(buf, owner=self.name)
-                    sim.buffer_pool.set_state(sim, buf.id, "allocated")
-                    dst = self.output_target or "memory"
-                    msg = Message(
-                        src=self.name,
-                        dst=dst,
-                        size=buf.size,
-                        kind="buffer_transfer",
-                        payload={"buffer": buf.to_dict()},
-                        created_at=sim.ticks,
-                    )
-                    self._emit_outputs(sim, [msg])
-                    sim.buffer_pool.set_state(sim, buf.id, "transit")
-                    # Mark consumed inputs as deallocated
-                    for slot in self._current_inputs:
-                        b = slot.get("buf")
-                        if isinstance(b, DataBuffer):
-                            sim.buffer_pool.set_state(sim, b.id, "deallocated")
-                            sim.buffer_pool.delete(b.id)
-                    self._current_inputs = []
-                    self._current_cmd = None
-                    self.state = "idle"
+        self._dummy_process(sim)
+
+    def _tick_pro(self, sim) -> None:
+        if not self._queues_registered:
+            self._register_queues(sim)
+        self._busy_this_tick = False
+        # Pro mode: simple state machine with random backpressure
+        if self.state == "idle":
+            self._start_command_if_ready()
+        if self.state == "backpressured":
+            if self._relieve_backpressure():
+                self.state = "busy"
+            else:
+                return
+        if self.state == "busy":
+            if self._simulate_backpressure():
+                self.state = "backpressured"
+                return
+            if not self._current_inputs:
+                self.state = "idle"
+                return
+            # Spend the budget on inputs in order; earlier inputs are already drained
+            remaining = self._remaining
+            n = len(remaining)
+            i = self._input_cursor
+            remaining_budget = self._consume_rate
+            consumed_total = 0
+            while i < n and remaining_budget > 0:
+                rem = remaining[i]
+                if rem > remaining_budget:
+                    remaining[i] = rem - remaining_budget
+                    consumed_total += remaining_budget
+                    remaining_budget = 0
+                    break
+                if rem > 0:
+                    remaining[i] = 0
+                    remaining_budget -= rem
+                    consumed_total += rem
+                i += 1
+            while i < n and remaining[i] <= 0:
+                i += 1
+            self._input_cursor = i
+            self._output_progress += consumed_total
+            self._busy_this_tick = consumed_total > 0
+            # Check if all inputs consumed
+            if i >= n:
+                # Build output buffer
+                out_size = max(1, self._expected_output_size)
+                buf = sim.buffer_pool.create(out_size, owner=self.name, role=BufferRoles.DEST)
+                sim.buffer_pool.set_state(sim, buf.id, "transit")
+                dst = self.output_target or "memory"
+                msg = Message(
+                    src=self.name,
+                    dst=dst,
+                    size=buf.size,
+                    kind="buffer_transfer",
+                    payload={"buffer": buf},
+                    created_at=sim.ticks,
+                )
+                self._emit_outputs(sim, [msg])
+                # Mark consumed inputs as deallocated
+                for b in self._current_inputs:
+                    if isinstance(b, DataBuffer):
+                        sim.buffer_pool.set_state(sim, b.id, "deallocated")
+                        sim.buffer_pool.delete(b.id)
+                self._current_inputs = []
+                self._remaining = []
+                self._input_cursor = 0
+                self._current_cmd = None
+                self.state = "idle"
 
     def finalize_tick(self, sim) -> None:
         self._ticks += 1
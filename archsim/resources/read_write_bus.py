@@ -6,6 +6,28 @@ from typing import Deque, Dict, List, Optional
 from ..core.channel import Channel
 
 
+def _advance_ring(ring: List[Deque], head: int) -> int:
+    """
+    Shift a pipeline ring by one stage and return the new head.
+
+    Stage k lives at ring[(head + k) % len(ring)]. The emptied last stage
+    becomes stage 0; anything it still holds (bandwidth leftovers) stays in
+    front of the stage moving into the last slot.
+    """
+    n = len(ring)
+    if n == 1:
+        return head
+    last_i = (head - 1) % n
+    old_last = ring[last_i]
+    if old_last:
+        new_last_i = (head - 2) % n
+        new_last = ring[new_last_i]
+        old_last.extend(new_last)
+        new_last.clear()
+        ring[new_last_i], ring[last_i] = old_last, new_last
+    return last_i
+
+
 class ReadBus(Channel):
     """
     ReadBus models a read interconnect that carries:
@@ -24,6 +46,23 @@ class ReadBus(Channel):
     - Per-requester response output: `out_<name>`
     """
 
+    __slots__ = (
+        "read_request_latency",
+        "data_response_latency",
+        "data_response_bandwidth",
+        "_out_req",
+        "_resp_in",
+        "_requesters",
+        "_rr_idx",
+        "_last_tick",
+        "_in_qs",
+        "_resp_outs",
+        "_req_pipeline",
+        "_resp_pipeline",
+        "_req_head",
+        "_resp_head",
+    )
+
     def __init__(
         self,
         name: str,
@@ -45,95 +84,112 @@ class ReadBus(Channel):
         # Ports
         self.add_port("out_req", direction="out")
         self.add_port("in_mem_resp", direction="in")
+        self._out_req: Deque = self.outbox["out_req"]
+        self._resp_in: Deque = self.inbox["in_mem_resp"]
 
         # Registered requester names and rr state
         self._requesters: List[str] = []
         self._rr_idx: int = 0
+        # Tick of the last tick() call; the RR pointer catches up on ticks slept through
+        self._last_tick: Optional[int] = None
+        # Input deques parallel to _requesters; response outputs by destination
+        self._in_qs: List[Deque] = []
+        self._resp_outs: Dict[Optional[str], Deque] = {}
 
-        # Internal pipelines
+        # Internal pipelines as rings (see _advance_ring); shifting moves a head index
         self._req_pipeline: List[Deque] = [deque() for _ in range(max(1, read_request_latency))]
         self._resp_pipeline: List[Deque] = [deque() for _ in range(max(1, data_response_latency))]
+        self._req_head: int = 0
+        self._resp_head: int = 0
 
     def add_requester(self, name: str) -> None:
         if name not in self._requesters:
             self._requesters.append(name)
             self.add_port(f"in_{name}", direction="in")
             self.add_port(f"out_{name}", direction="out")
+            self._in_qs.append(self.inbox[f"in_{name}"])
 
     # Helpers
     def _next_nonempty_from(self, start: int) -> Optional[int]:
-        if not self._requesters:
+        in_qs = self._in_qs
+        n = len(in_qs)
+        if not n:
             return None
-        n = len(self._requesters)
-        for i in range(n):
-            idx = (start + i) % n
-            port = f"in_{self._requesters[idx]}"
-            q = self.inbox.get(port)
-            if q and len(q) > 0:
+        start %= n
+        # Two straight passes instead of a modulo per candidate
+        for idx in range(start, n):
+            if in_qs[idx]:
+                return idx
+        for idx in range(start):
+            if in_qs[idx]:
                 return idx
         return None
 
+    def _out_for(self, dst: Optional[str]) -> Deque:
+        # Response output deque per destination; ports for late-bound destinations
+        # are created on first use
+        out = self._resp_outs.get(dst)
+        if out is None:
+            out_port = f"out_{dst}" if dst is not None else "out_unknown"
+            out = self._resp_outs[dst] = self.out_queue(out_port)
+        return out
+
+    def next_wakeup(self, sim) -> Optional[int]:
+        # Input-driven: idle once both pipelines and all inputs are empty
+        if self._resp_in or any(self._in_qs) or any(self._req_pipeline) or any(self._resp_pipeline):
+            return sim.ticks + 1
+        return None
+
     def tick(self, sim) -> None:
+        now = sim.ticks
+        last_tick = self._last_tick
+        self._last_tick = now
         # 1) Deliver any ready responses from the last stage to appropriate out_<dst> ports
         if self._resp_pipeline:
             capacity = self.data_response_bandwidth
-            last = self._resp_pipeline[-1]
-            while last and capacity >= getattr(last[0], "size", 1):
+            last = self._resp_pipeline[self._resp_head - 1]
+            while last and capacity >= last[0].size:
                 msg = last.popleft()
-                dst = getattr(msg, "dst", None)
-                out_port = f"out_{dst}" if dst is not None else "out_unknown"
-                # Ensure port exists for late-bound destinations
-                if out_port not in self.outbox:
-                    self.add_port(out_port, direction="out")
-                self.send(out_port, msg)
-                capacity -= getattr(msg, "size", 1)
+                self._out_for(msg.dst).append(msg)
+                capacity -= msg.size
 
             # Shift response pipeline forward
-            for i in range(len(self._resp_pipeline) - 1, 0, -1):
-                prev = self._resp_pipeline[i - 1]
-                cur = self._resp_pipeline[i]
-                while prev:
-                    cur.append(prev.popleft())
+            self._resp_head = _advance_ring(self._resp_pipeline, self._resp_head)
 
             # Accept new responses into stage 0 (no limit besides input queue)
-            inq = self.inbox.get("in_mem_resp")
-            if inq is not None:
-                while inq:
-                    self._resp_pipeline[0].append(inq.popleft())
+            inq = self._resp_in
+            if inq:
+                self._resp_pipeline[self._resp_head].extend(inq)
+                inq.clear()
 
         # 2) Deliver any ready requests from last stage to out_req (no bandwidth limit specified)
         if self._req_pipeline:
-            last = self._req_pipeline[-1]
-            while last:
-                self.send("out_req", last.popleft())
+            last = self._req_pipeline[self._req_head - 1]
+            if last:
+                self._out_req.extend(last)
+                last.clear()
 
             # Shift request pipeline forward
-            for i in range(len(self._req_pipeline) - 1, 0, -1):
-                prev = self._req_pipeline[i - 1]
-                cur = self._req_pipeline[i]
-                while prev:
-                    cur.append(prev.popleft())
+            self._req_head = _advance_ring(self._req_pipeline, self._req_head)
 
             # Accept new requests into stage 0 with RR across requesters
-            if self._requesters:
+            in_qs = self._in_qs
+            if in_qs:
+                n = len(in_qs)
                 start = self._rr_idx
+                if last_tick is not None and now - last_tick > 1:
+                    # The RR pointer advances once per tick, including ticks spent asleep
+                    start = (start + now - last_tick - 1) % n
+                stage0 = self._req_pipeline[self._req_head]
                 idx = self._next_nonempty_from(start)
                 visited = 0
-                moved_any = False
-                while idx is not None and visited < len(self._requesters):
-                    port = f"in_{self._requesters[idx]}"
-                    q = self.inbox.get(port)
-                    if q and q:
-                        self._req_pipeline[0].append(q.popleft())
-                        moved_any = True
+                while idx is not None and visited < n:
+                    stage0.append(in_qs[idx].popleft())
                     visited += 1
                     # Find next non-empty
-                    nxt = self._next_nonempty_from(idx + 1)
-                    if nxt is None:
-                        break
-                    idx = nxt
+                    idx = self._next_nonempty_from(idx + 1)
                 # Advance RR pointer each tick
-                self._rr_idx = (start + 1) % len(self._requesters)
+                self._rr_idx = (start + 1) % n
 
 
 class WriteBus(Channel):
@@ -154,6 +210,23 @@ class WriteBus(Channel):
     - Per-writer response output: `out_<name>`
     """
 
+    __slots__ = (
+        "write_request_latency",
+        "write_bandwidth",
+        "write_response_latency",
+        "_out_mem",
+        "_resp_in",
+        "_writers",
+        "_rr_idx",
+        "_last_tick",
+        "_in_qs",
+        "_resp_outs",
+        "_req_pipeline",
+        "_resp_pipeline",
+        "_req_head",
+        "_resp_head",
+    )
+
     def __init__(
         self,
         name: str,
@@ -173,85 +246,119 @@ class WriteBus(Channel):
 
         self.add_port("out_mem", direction="out")
         self.add_port("in_mem_resp", direction="in")
+        self._out_mem: Deque = self.outbox["out_mem"]
+        self._resp_in: Deque = self.inbox["in_mem_resp"]
 
         self._writers: List[str] = []
         self._rr_idx: int = 0
+        # Tick of the last tick() call; the RR pointer catches up on ticks slept through
+        self._last_tick: Optional[int] = None
+        # Input deques parallel to _writers; response outputs by destination
+        self._in_qs: List[Deque] = []
+        self._resp_outs: Dict[Optional[str], Deque] = {}
 
+        # Pipelines as rings (see _advance_ring); shifting moves a head index
         self._req_pipeline: List[Deque] = [deque() for _ in range(max(1, write_request_latency))]
         self._resp_pipeline: List[Deque] = [deque() for _ in range(max(1, write_response_latency))]
+        self._req_head: int = 0
+        self._resp_head: int = 0
 
     def add_writer(self, name: str) -> None:
         if name not in self._writers:
             self._writers.append(name)
             self.add_port(f"in_{name}", direction="in")
             self.add_port(f"out_{name}", direction="out")
+            self._in_qs.append(self.inbox[f"in_{name}"])
 
     def _next_nonempty_from(self, start: int) -> Optional[int]:
-        if not self._writers:
+        in_qs = self._in_qs
+        n = len(in_qs)
+        if not n:
             return None
-        n = len(self._writers)
-        for i in range(n):
-            idx = (start + i) % n
-            port = f"in_{self._writers[idx]}"
-            q = self.inbox.get(port)
-            if q and len(q) > 0:
+        start %= n
+        # Two straight passes instead of a modulo per candidate
+        for idx in range(start, n):
+            if in_qs[idx]:
+                return idx
+        for idx in range(start):
+            if in_qs[idx]:
                 return idx
         return None
 
+    def _out_for(self, dst: Optional[str]) -> Deque:
+        # Response output deque per destination; ports for late-bound destinations
+        # are created on first use
+        out = self._resp_outs.get(dst)
+        if out is None:
+            out_port = f"out_{dst}" if dst is not None else "out_unknown"
+            out = self._resp_outs[dst] = self.out_queue(out_port)
+        return out
+
+    def next_wakeup(self, sim) -> Optional[int]:
+        # Input-driven: idle once both pipelines and all inputs are empty
+        if self._resp_in or any(self._in_qs) or any(self._req_pipeline) or any(self._resp_pipeline):
+            return sim.ticks + 1
+        return None
+
     def tick(self, sim) -> None:
+        now = sim.ticks
+        last_tick = self._last_tick
+        self._last_tick = now
         # 1) Deliver ready responses
         if self._resp_pipeline:
-            last = self._resp_pipeline[-1]
+            last = self._resp_pipeline[self._resp_head - 1]
+            out_for = self._out_for
             while last:
                 msg = last.popleft()
-                dst = getattr(msg, "dst", None)
-                out_port = f"out_{dst}" if dst is not None else "out_unknown"
-                if out_port not in self.outbox:
-                    self.add_port(out_port, direction="out")
-                self.send(out_port, msg)
+                out_for(msg.dst).append(msg)
 
             # Shift
-            for i in range(len(self._resp_pipeline) - 1, 0, -1):
-                prev = self._resp_pipeline[i - 1]
-                cur = self._resp_pipeline[i]
-                while prev:
-                    cur.append(prev.popleft())
+            self._resp_head = _advance_ring(self._resp_pipeline, self._resp_head)
 
             # Accept new responses
-            inq = self.inbox.get("in_mem_resp")
-            if inq is not None:
-                while inq:
-                    self._resp_pipeline[0].append(inq.popleft())
+            inq = self._resp_in
+            if inq:
+                self._resp_pipeline[self._resp_head].extend(inq)
+                inq.clear()
 
         # 2) Deliver ready requests to memory subject to bandwidth
         if self._req_pipeline:
             capacity = self.write_bandwidth
-            last = self._req_pipeline[-1]
-            while last and capacity >= getattr(last[0], "size", 1):
-                msg = last.popleft()
-                self.send("out_mem", msg)
-                capacity -= getattr(msg, "size", 1)
+            last = self._req_pipeline[self._req_head - 1]
+            if last:
+                # Count the FIFO prefix that fits, then move it in one batch
+                k = 0
+                for msg in last:
+                    size = msg.size
+                    if size > capacity:
+                        break
+                    capacity -= size
+                    k += 1
+                if k:
+                    out = self._out_mem
+                    if k == len(last):
+                        out.extend(last)
+                        last.clear()
+                    else:
+                        popleft = last.popleft
+                        out.extend(popleft() for _ in range(k))
 
             # Shift
-            for i in range(len(self._req_pipeline) - 1, 0, -1):
-                prev = self._req_pipeline[i - 1]
-                cur = self._req_pipeline[i]
-                while prev:
-                    cur.append(prev.popleft())
+            self._req_head = _advance_ring(self._req_pipeline, self._req_head)
 
             # Accept new requests with RR arbitration; enforce bandwidth at egress only
-            if self._writers:
+            in_qs = self._in_qs
+            if in_qs:
+                n = len(in_qs)
                 start = self._rr_idx
+                if last_tick is not None and now - last_tick > 1:
+                    # The RR pointer advances once per tick, including ticks spent asleep
+                    start = (start + now - last_tick - 1) % n
+                stage0 = self._req_pipeline[self._req_head]
                 idx = self._next_nonempty_from(start)
                 visited = 0
-                while idx is not None and visited < len(self._writers):
-                    port = f"in_{self._writers[idx]}"
-                    q = self.inbox.get(port)
-                    if q and q:
-                        self._req_pipeline[0].append(q.popleft())
+                while idx is not None and visited < n:
+                    stage0.append(in_qs[idx].popleft())
                     visited += 1
-                    nxt = self._next_nonempty_from(idx + 1)
-                    if nxt is None:
-                        break
-                    idx = nxt
-                self._rr_idx = (start + 1) % len(self._writers)
+                    idx = self._next_nonempty_from(idx + 1)
+                self._rr_idx = (start + 1) % n
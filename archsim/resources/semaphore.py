@@ -12,6 +12,8 @@ class SemaphoreStation(Resource):
     Tracks an array of counting semaphores and processes client operations.
 
     - count: number of semaphores (default 32), each initialized to 0.
+    - emit_acks: send "sem_ack" messages (default True); clients that only
+      react to grants can turn them off to halve the response traffic.
 
     Supported operations via Message.kind:
     - "sem_signal": increment semaphore i. If any waiters are queued for i, grant
@@ -21,6 +23,9 @@ class SemaphoreStation(Resource):
 
     Message payload requirements:
     - payload["index"]: int semaphore index (0 <= index < count)
+    - payload["persistent"] (optional): keep the waiter subscribed; after each
+      grant it rejoins the tail of the wait queue, so one sem_wait yields a
+      grant per signal without the client re-arming.
 
     Responses:
     - "sem_granted": sent to waiting or immediate-wait clients when their wait is
@@ -29,34 +34,45 @@ class SemaphoreStation(Resource):
       {"index": i, "action": "signal"|"wait_enqueued"|"wait_immediate"}
     """
 
-    def __init__(self, name: str, count: int = 32) -> None:
+    def __init__(self, name: str, count: int = 32, emit_acks: bool = True) -> None:
         super().__init__(name)
         if count <= 0:
             raise ValueError("SemaphoreStation.count must be > 0")
         self.count = count
+        self.emit_acks = emit_acks
         self.values: List[int] = [0 for _ in range(count)]
-        self.waiters: List[Deque[Tuple[str, str]]] = [deque() for _ in range(count)]
+        # Per index: (dst, reply_to, persistent) in FIFO order
+        self.waiters: List[Deque[Tuple[str, str, bool]]] = [deque() for _ in range(count)]
 
         self.add_port("in", direction="in")
         self.add_port("out", direction="out")
+        self._inq: Deque = self.inbox["in"]
+        self._out: Deque = self.outbox["out"]
 
     def _validate_index(self, idx: int) -> None:
         if not (0 <= idx < self.count):
             raise IndexError(f"Semaphore index {idx} out of range [0,{self.count})")
 
+    def _send_grant(self, dst: str, idx: int, reply_to: str, sim) -> None:
+        grant = sim.message_pool.acquire(
+            src=self.name,
+            dst=dst,
+            size=1,
+            kind="sem_granted",
+            payload={"index": idx, "reply_to": reply_to},
+            created_at=sim.ticks,
+        )
+        self._out.append(grant)
+
     def _grant_waiter(self, idx: int, sim) -> bool:
         q = self.waiters[idx]
         if q:
-            dst, reply_to = q.popleft()
-            grant = Message(
-                src=self.name,
-                dst=dst,
-                size=1,
-                kind="sem_granted",
-                payload={"index": idx, "reply_to": reply_to},
-                created_at=sim.ticks,
-            )
-            self.send("out", grant)
+            waiter = q.popleft()
+            dst, reply_to, persistent = waiter
+            self._send_grant(dst, idx, reply_to, sim)
+            if persistent:
+                # Persistent waiters rejoin the tail instead of re-sending sem_wait
+                q.append(waiter)
             return True
         return False
 
@@ -64,8 +80,10 @@ class SemaphoreStation(Resource):
         # If someone is waiting, grant them instead of incrementing
         if not self._grant_waiter(idx, sim):
             self.values[idx] += 1
+        if not self.emit_acks:
+            return
         # Optional ack back to signaler
-        ack = Message(
+        ack = sim.message_pool.acquire(
             src=self.name,
             dst=req.src,
             size=1,
@@ -73,63 +91,60 @@ class SemaphoreStation(Resource):
             payload={"index": idx, "action": "signal", "value": self.values[idx], "reply_to": req.id},
             created_at=sim.ticks,
         )
-        self.send("out", ack)
+        self._out.append(ack)
 
     def _handle_wait(self, idx: int, req: Message, sim) -> None:
-        if self.values[idx] > 0:
+        payload = req.payload
+        persistent = bool(payload.get("persistent", False)) if payload else False
+        values = self.values
+        if values[idx] > 0:
             # Consume one unit and grant immediately
-            self.values[idx] -= 1
-            grant = Message(
-                src=self.name,
-                dst=req.src,
-                size=1,
-                kind="sem_granted",
-                payload={"index": idx, "reply_to": req.id},
-                created_at=sim.ticks,
-            )
-            self.send("out", grant)
-            # Optional ack (immediate)
-            ack = Message(
-                src=self.name,
-                dst=req.src,
-                size=1,
-                kind="sem_ack",
-                payload={"index": idx, "action": "wait_immediate", "value": self.values[idx], "reply_to": req.id},
-                created_at=sim.ticks,
-            )
-            self.send("out", ack)
+            values[idx] -= 1
+            self._send_grant(req.src, idx, req.id, sim)
+            action = "wait_immediate"
+            if persistent:
+                # Take every available unit, then stay subscribed for later signals
+                while values[idx] > 0:
+                    values[idx] -= 1
+                    self._send_grant(req.src, idx, req.id, sim)
+                self.waiters[idx].append((req.src, req.id, True))
         else:
             # Enqueue waiter
-            self.waiters[idx].append((req.src, req.id))
-            # Optional ack (enqueued)
-            ack = Message(
-                src=self.name,
-                dst=req.src,
-                size=1,
-                kind="sem_ack",
-                payload={"index": idx, "action": "wait_enqueued", "value": self.values[idx], "reply_to": req.id},
-                created_at=sim.ticks,
-            )
-            self.send("out", ack)
+            self.waiters[idx].append((req.src, req.id, persistent))
+            action = "wait_enqueued"
+        if not self.emit_acks:
+            return
+        # Optional ack
+        ack = sim.message_pool.acquire(
+            src=self.name,
+            dst=req.src,
+            size=1,
+            kind="sem_ack",
+            payload={"index": idx, "action": action, "value": values[idx], "reply_to": req.id},
+            created_at=sim.ticks,
+        )
+        self._out.append(ack)
 
     def tick(self, sim) -> None:
-        inq = self.inbox["in"]
+        inq = self._inq
+        if not inq:
+            return
+        count = self.count
+        release = sim.message_pool.release
         while inq:
             req = inq.popleft()
-            kind = getattr(req, "kind", None)
-            payload = getattr(req, "payload", {}) or {}
-            idx = int(payload.get("index", -1))
-            try:
-                self._validate_index(idx)
-            except Exception:
+            kind = req.kind
+            payload = req.payload
+            idx = int(payload.get("index", -1)) if payload else -1
+            if not (0 <= idx < count):
                 # Invalid index: ignore request
+                release(req)
                 continue
 
             if kind == "sem_signal":
                 self._handle_signal(idx, req, sim)
             elif kind == "sem_wait":
                 self._handle_wait(idx, req, sim)
-            else:
-                # Unknown op for this station; ignore
-                pass
+            # Unknown ops for this station are ignored
+            release(req)
 
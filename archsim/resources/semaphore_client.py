@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import Optional
 
 from ..core.resource import Resource
-from ..core.message import Message
 
 
 class SemaphoreClient(Resource):
@@ -28,12 +27,13 @@ class SemaphoreClient(Resource):
         inq = self.inbox["in"]
         while inq:
             msg = inq.popleft()
-            if getattr(msg, "kind", None) == "sem_granted":
+            if msg.kind == "sem_granted":
                 self.granted += 1
+            sim.message_pool.release(msg)
 
         # Emit waits
         if self._next is not None and sim.ticks >= self._next:
-            m = Message(
+            m = sim.message_pool.acquire(
                 src=self.name,
                 dst=self.station,
                 size=1,
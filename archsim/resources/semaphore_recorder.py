@@ -3,32 +3,36 @@ from __future__ import annotations
 from typing import Optional, List
 
 from ..core.resource import Resource
-from ..core.message import Message
 
 
 class SemaphoreRecorder(Resource):
     """
     Records the ticks when a semaphore is granted. It continuously waits on
     the given semaphore index by re-issuing a wait after each grant.
+
+    With persistent=True it sends a single persistent wait instead and the
+    station keeps it subscribed, saving a sem_wait round trip per grant. Grants
+    then arrive without the re-arm delay, so recorded ticks can differ.
     """
 
-    def __init__(self, name: str, station: str, index: int, start_tick: int = 0) -> None:
+    def __init__(self, name: str, station: str, index: int, start_tick: int = 0, persistent: bool = False) -> None:
         super().__init__(name)
         self.add_port("out", direction="out")
         self.add_port("in", direction="in")
         self.station = station
         self.index = int(index)
         self.start_tick = max(0, start_tick)
+        self.persistent = persistent
         self._armed = False
         self.grants: List[int] = []
 
     def _issue_wait(self, sim) -> None:
-        m = Message(
+        m = sim.message_pool.acquire(
             src=self.name,
             dst=self.station,
             size=1,
             kind="sem_wait",
-            payload={"index": self.index},
+            payload={"index": self.index, "persistent": True} if self.persistent else {"index": self.index},
             created_at=sim.ticks,
         )
         self.send("out", m)
@@ -43,8 +47,10 @@ class SemaphoreRecorder(Resource):
         inq = self.inbox["in"]
         while inq:
             msg = inq.popleft()
-            if getattr(msg, "kind", None) == "sem_granted":
+            if msg.kind == "sem_granted":
                 self.grants.append(sim.ticks)
                 # Re-arm immediately to catch subsequent signals
-                self._issue_wait(sim)
+                if not self.persistent:
+                    self._issue_wait(sim)
+            sim.message_pool.release(msg)
 
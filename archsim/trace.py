@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .resources.pe import ProcessingElement
 
 
 @dataclass
@@ -15,6 +17,21 @@ class TraceOptions:
 class ConsoleTracer:
     def __init__(self, options: Optional[TraceOptions] = None) -> None:
         self.opt = options or TraceOptions()
+        # Per resource: (resource, #inbox ports, #outbox ports, [(label, deque)]);
+        # an entry is rebuilt only when the resource gains ports
+        self._port_entries: Dict[str, Tuple[object, int, int, List[Tuple[str, Deque]]]] = {}
+        self._pes: List[Tuple[str, ProcessingElement]] = []
+        self._resource_count: int = -1
+
+    def _entries_for(self, name: str, res) -> List[Tuple[str, Deque]]:
+        inbox, outbox = res.inbox, res.outbox
+        cached = self._port_entries.get(name)
+        if cached is not None and cached[0] is res and cached[1] == len(inbox) and cached[2] == len(outbox):
+            return cached[3]
+        entries = [("in:" + port, q) for port, q in inbox.items()]
+        entries += [("out:" + port, q) for port, q in outbox.items()]
+        self._port_entries[name] = (res, len(inbox), len(outbox), entries)
+        return entries
 
     def on_tick(self, sim) -> None:
         t = sim.ticks
@@ -23,16 +40,16 @@ class ConsoleTracer:
 
         print(f"[tick {t}]")
 
+        resources = sim.topology.resources
+        show_empty = self.opt.show_empty
+        if len(resources) != self._resource_count:
+            self._resource_count = len(resources)
+            self._pes = [(name, res) for name, res in resources.items() if isinstance(res, ProcessingElement)]
+
         if self.opt.queues:
-            for name, res in sim.topology.resources.items():
+            for name, res in resources.items():
                 # Collect non-empty queues (or all if show_empty)
-                lines = []
-                for port, q in res.inbox.items():
-                    if self.opt.show_empty or len(q) > 0:
-                        lines.append(f"in:{port}={len(q)}")
-                for port, q in res.outbox.items():
-                    if self.opt.show_empty or len(q) > 0:
-                        lines.append(f"out:{port}={len(q)}")
+                lines = [f"{label}={len(q)}" for label, q in self._entries_for(name, res) if show_empty or q]
                 if lines:
                     print(f"  res {name}: " + ", ".join(lines))
 
@@ -40,32 +57,20 @@ class ConsoleTracer:
             for lk in sim.topology.links:
                 occ = sum(len(stage) for stage in getattr(lk, "pipeline", []))
                 moved = getattr(lk, "bytes_moved_this_tick", 0)
-                if self.opt.show_empty or moved > 0 or occ > 0:
+                if show_empty or moved > 0 or occ > 0:
                     print(
                         f"  link {lk.name}: moved={moved}B, occ={occ}, bw={lk.bandwidth}, lat={lk.latency}"
                     )
         # Channels occupancy
-        try:
-            from .core.channel import Channel  # type: ignore
-        except Exception:
-            Channel = None  # type: ignore
-        if Channel is not None:
-            for name, res in sim.topology.resources.items():
-                if isinstance(res, Channel):
-                    if self.opt.show_empty or res._active_count > 0:
-                        print(
-                            f"  chan {name}: active={res._active_count}, mode={res.transfer_mode}, avg={res.avg_occupancy:.2f}"
-                        )
+        for ch in sim.topology.channels:
+            if show_empty or ch._active_count > 0:
+                print(
+                    f"  chan {ch.name}: active={ch._active_count}, mode={ch.transfer_mode}, avg={ch.avg_occupancy:.2f}"
+                )
         # Processing elements busy state
-        try:
-            from .resources.pe import ProcessingElement  # type: ignore
-        except Exception:
-            ProcessingElement = None  # type: ignore
-        if ProcessingElement is not None:
-            for name, res in sim.topology.resources.items():
-                if isinstance(res, ProcessingElement):
-                    # res._busy_this_tick is updated during tick; finalize happens after
-                    if self.opt.show_empty or res._busy_this_tick:
-                        print(
-                            f"  pe   {name}: busy={res._busy_this_tick}, mode={res.mode}, avg={res.avg_utilization:.2f}"
-                        )
+        for name, res in self._pes:
+            # res._busy_this_tick is updated during tick; finalize happens after
+            if show_empty or res._busy_this_tick:
+                print(
+                    f"  pe   {name}: busy={res._busy_this_tick}, mode={res.mode}, avg={res.avg_utilization:.2f}"
+                )
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from archsim.core.simulator import Simulator
+from archsim.core.topology import Topology
+from archsim.resources.arbiter import Arbiter
+from archsim.resources.compute import ComputeUnit
+from archsim.resources.memory import Memory
+
+
+def build(topo: Topology) -> Simulator:
+    # Shared-mode arbiter with no downstream channel: ports must be freed every
+    # tick, so each of the CPU's requests is forwarded on consecutive ticks
+    cpu = ComputeUnit("cpu0", total_requests=3, request_size=64, issue_interval=1)
+    arb = Arbiter("arb", mode="shared")
+    mem = Memory("memory", latency=1, max_issue_per_tick=1)
+
+    arb.add_input("in0")
+    topo.add(cpu, arb, mem)
+
+    topo.connect(cpu, "out", arb, "in0", bandwidth=128, latency=1)
+    topo.connect(arb, "out", mem, "in", bandwidth=128, latency=1)
+    topo.connect(mem, "out", cpu, "in", bandwidth=128, latency=0)
+
+    return Simulator(topo)
+
+
+if __name__ == "__main__":
+    topo = Topology()
+    sim = build(topo)
+    sim.run(max_ticks=30)
+    print(sim.metrics.summary())
+    cpu = topo.get("cpu0")
+    if cpu._received != cpu.total_requests:
+        raise SystemExit(f"expected {cpu.total_requests} responses, got {cpu._received}")
@@ -23,5 +23,6 @@ function Run-Cmd($name, $cmd) {
 Run-Cmd "built-in" "python -m archsim --max-ticks $maxTicks"
 Run-Cmd "channel_modes_compare" "python -m archsim examples/channel_modes_compare.py --max-ticks $maxTicks"
 Run-Cmd "semaphore_triggers" "python -m archsim examples/semaphore_triggers.py --max-ticks $maxTicks"
+Run-Cmd "arbiter_no_downstream" "python -m examples.arbiter_no_downstream"
 
 Write-Host "Regression completed successfully."